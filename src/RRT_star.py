@@ -1,8 +1,14 @@
 #!/usr/bin/env python
 from math import sqrt,pi, cos, sin, atan2
-from random import random
+from random import random, Random
 import matplotlib.pyplot as plt
+import numpy as np
 from numpy import linspace
+from spatial import make_index
+from collision import CollisionChecker, BOARD_LINES
+from sampling import make_sampler
+from extend import extend, extend_batch
+from tree import Tree
 
 WIDTH = 150
 LENGTH = 150
@@ -22,6 +28,7 @@ start = [START_X,START_Y]
 GOAL_X, GOAL_Y = 0,50
 RADIUS = 6
 radius=18
+wall_clearance = 1.5
 
 
 ## Import goals
@@ -126,35 +133,31 @@ def get_goal(tic):
 
 
 def collision(new_node,obstacles):
-    for i in range(len(obstacles)):
-        dist_obs = sqrt(pow(new_node.x-obstacles[i][0],2)+pow(new_node.y-obstacles[i][1],2))
-        if dist_obs <= radius+1: #or new_node[0] <= 0 or new_node[0] >= width or new_node[1] <= 0 or new_node[1] >= length:
-            collision_flag = 1
-            return collision_flag
-        # if newnode[0] <= 0 or newnode[0] >= width or newnode[1] <= 0 or newnode[1] >= length:
-        #     collision_flag = 1
-            #return collision_flag
-        else:
-            collision_flag = 0
+    if not CollisionChecker(obstacles, radius+1).point_free(new_node.x, new_node.y):
+        return 1
+    return 0
 
 
 
-def setup_space(goal):
+def setup_space(goal, placed=None):
+    if placed == None:
+        placed = obstacles
     figure, ax = plt.subplots(facecolor='white')
     ax.set_ylim((0,LENGTH))
     ax.set_xlim((0,WIDTH))
     plt.xlim()
     plt.ylim()
     plt.title(TITLE)
-    ax.set_axis_bgcolor('white')
+    # set_axis_bgcolor was renamed set_facecolor in matplotlib 2.0
+    (getattr(ax, 'set_facecolor', None) or ax.set_axis_bgcolor)('white')
     start_n = plt.Circle((start[0],start[1]),1, color = 'aqua')
     goal_n = plt.Circle((goal[0],goal[1]),goal[2], color = 'green')
     ax.add_artist(start_n)
     ax.add_artist(goal_n)
 
     plot_goals = []
-    for l in range(len(obstacles)):
-        plot_obstacles=plt.Circle((obstacles[l][0],obstacles[l][1]),18,color='black')
+    for l in range(len(placed)):
+        plot_obstacles=plt.Circle((placed[l][0],placed[l][1]),18,color='black')
         ax.add_artist(plot_obstacles)               
     for k in range(len(goals)):
         plot_goals = plt.Circle((goals[k][0], goals[k][1]), 2, color='red')
@@ -175,58 +178,85 @@ def mapping(OldMax, OldMin, NewMax, NewMin, OldValue):
     return NewValue
 
 
-def RRT(tic):
+def RRT(tic, index='grid', render=True, trace=None, walls=False, batch=None, seed=None,
+        max_iterations=None, stats=None, sampler='uniform', goal_bias=0.05, box=None):
     ##Define Initial Parameters
     goal = get_goal(tic)
-    figure = setup_space(goal)
-    start_node = Node(START_X,START_Y)
-    goal_node = Node(goal[0],goal[1])
-    current_node = start_node
-    figure, plt.plot([0,100], [33, 33], color = 'grey', linewidth = 3)
-    figure, plt.plot([0,100], [66, 66], color = 'grey', linewidth = 3)
-    figure, plt.plot([33,33], [0, 100], color = 'grey', linewidth = 3)
-    figure, plt.plot([66,66], [0, 100], color = 'grey', linewidth = 3)
-   # print('Distance to goal is {}'.format(current_node.distance_to(goal_node)))
-    nodes = []
-    nodes.append(start_node)
-
-    ##Setup plots
+    if render:
+        figure = setup_space(goal)
+    if trace != None:
+        trace.start(goal, obstacles)
+
+    def draw(xs, ys, **style):
+        if render:
+            plt.plot(xs, ys, **style)
+        if trace != None:
+            trace.plot(xs, ys, **style)
+
+    draw([0,100], [33, 33], color = 'grey', linewidth = 3)
+    draw([0,100], [66, 66], color = 'grey', linewidth = 3)
+    draw([33,33], [0, 100], color = 'grey', linewidth = 3)
+    draw([66,66], [0, 100], color = 'grey', linewidth = 3)
+    # the board lines only become walls on request, they box in the middle cell
+    checker = CollisionChecker(obstacles, radius+1, BOARD_LINES if walls else (), wall_clearance)
+    # nodes are ids into the array-backed tree, the index only stores ids
+    tree = Tree()
+    nodes = make_index(index, neighborhood)
+    current = tree.add(START_X, START_Y)
+    nodes.insert(current, START_X, START_Y)
+    # the whole space unless a tighter workspace box is given
+    sampler = make_sampler(sampler, box or (0, 0, WIDTH, LENGTH), start, goal, goal_bias)
+    if batch:
+        # k samples per step through NumPy, reproducible for a given seed
+        rng = np.random.RandomState(seed)
+        candidates = extend_batch(tree, nodes, checker,
+                                  lambda k: sampler.sample_batch(rng, k), EPSILON, batch)
+    else:
+        rand = Random(seed).random if seed != None else random
+        candidates = extend(tree, nodes, checker, lambda: sampler.sample(rand), EPSILON)
 
     #main loop
-    while current_node.distance_to(goal_node) > goal[2]: 
-        neighbors = []
-        new_node = Node(random()*WIDTH, random()*LENGTH)
-        #print(new_node)
-        closest_node = new_node.closest2(nodes)
-       # print('distance to parent is {}'.format(new_node.distance_to(parent)))
-        if new_node.distance_to(closest_node) > EPSILON:
-            #print('Too Long')
-            new_node = get_theta_node(new_node,closest_node)
-            #print('new distance to parent is {}'.format(new_node.distance_to(parent)))
-        for node in nodes:
-            if node.distance_to(new_node) < neighborhood:
-                neighbors.append(node)
-        collision_flag=0
-        collision_flag=collision(new_node,obstacles)
-        if(collision_flag==1):
+    iterations = 0
+    samples = 0
+    while tree.distance_to_point(current, goal[0], goal[1]) > goal[2]:
+        if max_iterations != None and iterations >= max_iterations:
+            # give up without placing the piece
+            if stats != None:
+                stats.update(iterations=iterations, samples=samples, nodes=len(tree), cost=None)
+            return None
+        iterations += 1
+        new_x, new_y, closest, drawn = next(candidates)
+        samples += drawn
+        closest_x, closest_y = tree.x[closest], tree.y[closest]
+        neighbors = nodes.near(new_x, new_y, neighborhood)
+        # only neighbors with a clear edge to the new node can be its parent
+        free = checker.edges_free([(tree.x[node], tree.y[node]) for node in neighbors],
+                                  [(new_x, new_y)]*len(neighbors))
+        parents = [node for node, ok in zip(neighbors, free) if ok]
+        if not parents:
             continue
-        
-        best_parent = new_node.optimal(neighbors)
-        figure, plt.plot([new_node.x, best_parent.x], [new_node.y, best_parent.y], color = 'blue',linewidth = 2)
-        figure, plt.plot([new_node.x, closest_node.x], [new_node.y, closest_node.y], color = 'red',linewidth = 1)
-        plt.pause(0.0001)
-       
-        #current_node = Node(new_node.x, new_node.y, parent = closest_node)
-        current_node = Node(new_node.x, new_node.y, parent = best_parent)
-        nodes.append(current_node)
-        half_way1=((new_node.x+best_parent.x)/2,(new_node.y+best_parent.y)/2)
-        half_way2=((new_node.x+closest_node.x)/2,(new_node.y+closest_node.y)/2)
+
+        best_parent = min(parents, key=lambda node: tree.cost[node] + tree.distance_to_point(node, new_x, new_y))
+        parent_x, parent_y = tree.x[best_parent], tree.y[best_parent]
+        draw([new_x, parent_x], [new_y, parent_y], color = 'blue',linewidth = 2)
+        draw([new_x, closest_x], [new_y, closest_y], color = 'red',linewidth = 1)
+        if render:
+            plt.pause(0.0001)
+        if trace != None:
+            trace.frame()
+
+        current = tree.add(new_x, new_y, best_parent)
+        nodes.insert(current, new_x, new_y)
+        half_way1=((new_x+parent_x)/2,(new_y+parent_y)/2)
+        half_way2=((new_x+closest_x)/2,(new_y+closest_y)/2)
         goal_check1=sqrt(pow(half_way1[0]-goal[0],2)+pow(half_way1[1]-goal[1],2))
         goal_check2=sqrt(pow(half_way2[0]-goal[0],2)+pow(half_way2[1]-goal[1],2))
         if goal_check1<goal[2] or goal_check2<goal[2] :
             break
         #raw_input("hi")
-    path = current_node.path_to_start()
+    if stats != None:
+        stats.update(iterations=iterations, samples=samples, nodes=len(tree), cost=tree.cost[current])
+    path = tree.node(current).path_to_start()
     
     final_list = []
 
@@ -235,7 +265,7 @@ def RRT(tic):
             new_x = mapping(150, 0, 0.5, 0, node.parent.x)
             new_y = mapping(0, 150, 0.8, 0.4, node.parent.y)
             final_list.append([new_x, new_y])
-            figure, plt.plot([node.x, node.parent.x], [node.y, node.parent.y], color = 'cyan')
+            draw([node.x, node.parent.x], [node.y, node.parent.y], color = 'cyan')
 
             ##used to print out coordinates
             #print(node.x, node.y, 0, 0 ,0 ,0)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Carrying out planned paths with a pick-and-place arm.
+
+A session holds an arm that is already set up and reuses it for every
+plan: solve() turns a path of board points into a joint trajectory,
+execute() picks a piece up, follows the trajectory and puts the piece
+down on the last point, and run() does both.
+
+Plans handed to submit() are run in order by a worker thread, so the
+game loop does not block on the arm. wait() blocks until they are all
+done and raises the first error any of them hit; close() stops the
+worker.
+
+The arm needs _servo_to_pose, _approach, gripper_open, gripper_close,
+joint_path and follow_joint_path like custom.PickAndPlace, and pose(x, y, z)
+builds a pose with the gripper pointing down.
+"""
+import threading
+
+try:
+    import queue
+except ImportError:
+    # python 2
+    import Queue as queue
+
+# pick-up location, and how high the gripper is at a cell and when placing
+PICK = (0.4, 0.5)
+UP, DOWN = 0.05, -0.1
+
+
+class ArmSession(object):
+
+    def __init__(self, arm, pose, hover_distance=0.15, log=None):
+        self.arm = arm
+        self.pose = pose
+        self.hover_distance = hover_distance
+        self.log = log
+        self.up = pose(PICK[0], PICK[1], UP)
+        self.down = pose(PICK[0], PICK[1], DOWN)
+        self.errors = []
+        self.plans = queue.Queue()
+        self.worker = threading.Thread(target=self._work)
+        self.worker.daemon = True
+        self.worker.start()
+
+    def solve(self, nodelist):
+        # joints for every waypoint, solved in one request before the arm moves
+        approaches = [self.pose(node_x, node_y, UP + self.hover_distance)
+                      for node_x, node_y in nodelist]
+        return self.arm.joint_path(approaches)
+
+    def execute(self, nodelist, trajectory):
+        arm = self.arm
+        arm._servo_to_pose(self.down)
+        arm.gripper_close()
+        arm._approach(self.up)
+
+        arm.follow_joint_path(trajectory)
+
+        node_x, node_y = nodelist[-1]
+        arm._servo_to_pose(self.pose(node_x, node_y, DOWN))
+        arm.gripper_open()
+        arm._approach(self.pose(node_x, node_y, UP))
+
+    def run(self, nodelist):
+        """Move a piece along nodelist, False if a waypoint is unreachable."""
+        trajectory = self.solve(nodelist)
+        if trajectory is None:
+            if self.log != None:
+                self.log("Plan has an unreachable waypoint, not moving.")
+            return False
+        self.execute(nodelist, trajectory)
+        return True
+
+    def _work(self):
+        while True:
+            nodelist = self.plans.get()
+            try:
+                if nodelist is None:
+                    return
+                if not self.run(nodelist):
+                    raise ValueError('unreachable waypoint in {!r}'.format(nodelist))
+            except Exception as e:
+                # kept for wait(), the plans behind this one still run
+                if self.log != None:
+                    self.log("Plan failed: %s" % (e,))
+                self.errors.append(e)
+            finally:
+                self.plans.task_done()
+
+    def submit(self, nodelist):
+        self.plans.put(list(nodelist))
+
+    def wait(self):
+        self.plans.join()
+        errors, self.errors = self.errors, []
+        if errors:
+            raise errors[0]
+
+    def close(self):
+        self.plans.put(None)
+        self.worker.join()
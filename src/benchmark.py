@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+"""
+Reproducible benchmark of the RRT planners.
+
+Runs both planners headless for every goal cell, obstacle layout and
+sampling strategy with fixed seeds and records wall time, iterations to
+the goal, samples drawn (collision-rejected ones included), tree nodes,
+path cost and peak memory per run. Results are written as JSON; pass an earlier
+results file with --compare to see the change per planner and layout.
+
+    python benchmark.py --output bench.json
+    python benchmark.py --output new.json --compare bench.json
+    python benchmark.py --sampler uniform --sampler goal
+
+The informed sampler only changes anything once a first path is known,
+and these planners stop at the first path, so it is not offered here.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import RRT_star
+import rtica
+
+try:
+    import tracemalloc
+except ImportError:
+    # python 2, fall back to the process high-water mark
+    tracemalloc = None
+    import resource
+
+# informed sampling needs anytime planning to matter, see the module docstring
+SAMPLERS = ('uniform', 'goal')
+
+PLANNERS = {
+    'RRT_star': RRT_star,
+    'rtica': rtica,
+}
+
+# goal cells already holding a piece
+LAYOUTS = {
+    'empty': [],
+    'corners': [1, 3, 7],
+    'middle': [2, 5],
+    'crowded': [1, 2, 4, 6],
+}
+
+
+def plan(module, tic, layout, seed, **options):
+    module.obstacles[:] = [module.get_goal(cell) for cell in LAYOUTS[layout]]
+    stats = {}
+    try:
+        path = module.RRT(tic, render=False, seed=seed, stats=stats, **options)
+    finally:
+        del module.obstacles[:]
+    return path, stats
+
+
+def run(module, tic, layout, seed, sampler='uniform', **options):
+    options['sampler'] = sampler
+    begin = time.time()
+    path, stats = plan(module, tic, layout, seed, **options)
+    wall_time = time.time() - begin
+    # memory is measured on a second, identical run so tracing does not skew the time
+    if tracemalloc != None:
+        tracemalloc.start()
+        plan(module, tic, layout, seed, **options)
+        memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*1024
+    return {
+        'tic': tic,
+        'layout': layout,
+        'sampler': sampler,
+        'seed': seed,
+        'solved': path != None,
+        'wall_time': wall_time,
+        'iterations': stats['iterations'],
+        'samples': stats['samples'],
+        'nodes': stats['nodes'],
+        'cost': stats['cost'],
+        'memory': memory,
+    }
+
+
+def benchmark(planners, layouts, seeds, samplers=('uniform',), **options):
+    results = {}
+    for name in planners:
+        runs = []
+        for sampler in samplers:
+            for layout in layouts:
+                for tic in range(1, 10):
+                    if tic in LAYOUTS[layout]:
+                        continue
+                    for seed in seeds:
+                        runs.append(run(PLANNERS[name], tic, layout, seed, sampler, **options))
+        results[name] = runs
+    return results
+
+
+def summarize(runs):
+    solved = [r for r in runs if r['solved']]
+    def mean(key, rows):
+        return sum(r[key] for r in rows) / float(len(rows)) if rows else None
+    return {
+        'runs': len(runs),
+        'solved': len(solved),
+        'wall_time': mean('wall_time', runs),
+        'iterations': mean('iterations', runs),
+        'samples': mean('samples', runs),
+        'nodes': mean('nodes', runs),
+        'cost': mean('cost', solved),
+        'memory': max(r['memory'] for r in runs) if runs else None,
+    }
+
+
+def summary_table(results):
+    table = {}
+    for name, runs in sorted(results.items()):
+        for group in sorted(set((r['sampler'], r['layout']) for r in runs)):
+            table['{}/{}/{}'.format(name, *group)] = summarize(
+                [r for r in runs if (r['sampler'], r['layout']) == group])
+    return table
+
+
+def compare(table, baseline):
+    for key in sorted(table):
+        if key not in baseline:
+            continue
+        changes = []
+        for column in ('wall_time', 'iterations', 'samples', 'nodes', 'cost', 'memory'):
+            # results from before a column existed have nothing to compare
+            old, new = baseline[key].get(column), table[key][column]
+            if old and new != None:
+                changes.append('{} {:+.1%}'.format(column, new/float(old) - 1))
+        print('{:<30} {}'.format(key, ', '.join(changes)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--planner', action='append', choices=sorted(PLANNERS))
+    parser.add_argument('--layout', action='append', choices=sorted(LAYOUTS))
+    parser.add_argument('--seeds', type=int, default=3, help='seeds 0..N-1 per goal')
+    parser.add_argument('--max-iterations', type=int, default=20000)
+    parser.add_argument('--sampler', action='append', choices=SAMPLERS)
+    parser.add_argument('--goal-bias', type=float, default=0.05)
+    parser.add_argument('--index', default='grid')
+    parser.add_argument('--batch', type=int)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='JSON results of an earlier run')
+    args = parser.parse_args()
+
+    results = benchmark(args.planner or sorted(PLANNERS), args.layout or sorted(LAYOUTS),
+                        range(args.seeds), args.sampler or ['uniform'], index=args.index,
+                        batch=args.batch, goal_bias=args.goal_bias,
+                        max_iterations=args.max_iterations)
+    table = summary_table(results)
+    for key, row in sorted(table.items()):
+        print('{:<30} {}/{} solved, {:.3f}s, {:.0f} iterations, {:.0f} samples, {:.0f} nodes'.format(
+            key, row['solved'], row['runs'], row['wall_time'], row['iterations'], row['samples'],
+            row['nodes']))
+    if args.output:
+        with open(args.output, 'w') as data:
+            json.dump({'python': platform.python_version(),
+                       'options': vars(args),
+                       'summary': table,
+                       'runs': results}, data, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as data:
+            compare(table, json.load(data)['summary'])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
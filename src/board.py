@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Compact encoding of tic-tac-toe boards.
+
+A board is the 9-cell grid list used by TTT, ' ', 'X' or 'O' per cell.
+encode() maps it to a base-3 integer in range(STATES), cell i being
+digit i, so states can index NumPy arrays directly.
+
+The 8 rotations and reflections of the board (the D4 group) are given
+as cell permutations, SYMMETRIES[g][i] being the cell that moves to i.
+CANONICAL[code] is the smallest code among the 8 images of a board and
+TRANSFORM[code] the symmetry that produces it; ACTIONS[g][cell] is where
+that symmetry moves a cell, so a move can follow its board.
+
+Bitboards hold one player's pieces as a 9-bit int, bit i for cell i.
+WINNING[bits] is True when those pieces complete a line, and a board
+is full when both players' bits together equal FULL.
+"""
+import numpy as np
+
+MARKS = {' ': 0, 'X': 1, 'O': 2}
+CHARS = ' XO'
+STATES = 3**9
+POWERS = 3**np.arange(9)
+
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8),
+         (0, 3, 6), (1, 4, 7), (2, 5, 8),
+         (0, 4, 8), (2, 4, 6)]
+WIN_MASKS = [sum(1 << cell for cell in line) for line in LINES]
+WINNING = [any(bits & mask == mask for mask in WIN_MASKS) for bits in range(512)]
+FULL = 0x1ff
+
+
+def encode(grid):
+    code = 0
+    for char in reversed(grid):
+        code = 3*code + MARKS[char]
+    return code
+
+
+def decode(code):
+    grid = []
+    for i in range(9):
+        grid.append(CHARS[code % 3])
+        code //= 3
+    return grid
+
+
+def encode_batch(boards):
+    # boards as an (n, 9) array of 0, 1, 2 per cell
+    return np.asarray(boards).dot(POWERS)
+
+
+ROTATE = np.array([6, 3, 0, 7, 4, 1, 8, 5, 2])
+REFLECT = np.array([2, 1, 0, 5, 4, 3, 8, 7, 6])
+
+
+def _symmetries():
+    found = []
+    perm = np.arange(9)
+    for turn in range(4):
+        found.append(perm)
+        found.append(perm[REFLECT])
+        perm = perm[ROTATE]
+    return np.array(found)
+
+
+SYMMETRIES = _symmetries()
+ACTIONS = np.argsort(SYMMETRIES, axis=1)
+
+
+def _canonical_tables():
+    digits = (np.arange(STATES)[:, None] // POWERS) % 3
+    images = np.column_stack([encode_batch(digits[:, perm]) for perm in SYMMETRIES])
+    transform = images.argmin(1)
+    return images[np.arange(STATES), transform], transform
+
+
+CANONICAL, TRANSFORM = _canonical_tables()
+
+
+def canonical(grid, action=None):
+    """Canonical code of a board, and where action lands on that board."""
+    code = encode(grid)
+    if action == None:
+        return int(CANONICAL[code])
+    return int(CANONICAL[code]), int(ACTIONS[TRANSFORM[code], action-1]) + 1
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""
+Batch collision checks for the RRT planners.
+
+Obstacles are the circles of the pieces already placed on the board, kept
+in one NumPy array so a whole batch of points or edges is tested against
+all of them in a single call. Edges use an exact segment-circle test.
+The board lines can be added as walls, they are only drawn by default.
+"""
+import numpy as np
+
+# the grid lines RRT() draws on the 100 x 100 board
+BOARD_LINES = [((0, 33), (100, 33)),
+               ((0, 66), (100, 66)),
+               ((33, 0), (33, 100)),
+               ((66, 0), (66, 100))]
+
+
+def _cross(u, v):
+    return u[..., 0]*v[..., 1] - u[..., 1]*v[..., 0]
+
+
+def point_segment_distance(p, a, b):
+    """Distance from points p to segments ab, all broadcast over leading axes."""
+    ab = b - a
+    length2 = (ab**2).sum(-1)
+    t = ((p - a)*ab).sum(-1) / np.where(length2 > 0, length2, 1)
+    t = np.clip(t, 0, 1)
+    closest = a + t[..., None]*ab
+    return np.sqrt(((p - closest)**2).sum(-1))
+
+
+def segment_segment_distance(a, b, c, d):
+    """Distance between segments ab and cd, zero where they cross."""
+    distance = np.minimum(
+        np.minimum(point_segment_distance(a, c, d), point_segment_distance(b, c, d)),
+        np.minimum(point_segment_distance(c, a, b), point_segment_distance(d, a, b)))
+    o1 = _cross(b - a, c - a)
+    o2 = _cross(b - a, d - a)
+    o3 = _cross(d - c, a - c)
+    o4 = _cross(d - c, b - c)
+    crossing = (o1*o2 < 0) & (o3*o4 < 0)
+    return np.where(crossing, 0.0, distance)
+
+
+class CollisionChecker(object):
+
+    def __init__(self, obstacles, clearance, walls=(), wall_clearance=0):
+        self.centers = np.array([obstacle[:2] for obstacle in obstacles], dtype=float).reshape(-1, 2)
+        self.clearance = clearance
+        self.walls = np.array(walls, dtype=float).reshape(-1, 2, 2)
+        self.wall_clearance = wall_clearance
+
+    def points_free(self, points):
+        """True for every (x, y) in points that is clear of all obstacles."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        free = np.ones(len(points), dtype=bool)
+        if len(self.centers):
+            d2 = ((points[:, None, :] - self.centers[None, :, :])**2).sum(-1)
+            free &= ~(d2 <= self.clearance**2).any(1)
+        if len(self.walls):
+            distance = point_segment_distance(points[:, None, :],
+                                              self.walls[None, :, 0], self.walls[None, :, 1])
+            free &= ~(distance <= self.wall_clearance).any(1)
+        return free
+
+    def edges_free(self, starts, ends):
+        """True for every segment starts[i] -> ends[i] that is clear of all obstacles."""
+        starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        free = np.ones(len(starts), dtype=bool)
+        if len(self.centers):
+            distance = point_segment_distance(self.centers[None, :, :],
+                                              starts[:, None, :], ends[:, None, :])
+            free &= ~(distance <= self.clearance).any(1)
+        if len(self.walls):
+            distance = segment_segment_distance(starts[:, None, :], ends[:, None, :],
+                                                self.walls[None, :, 0], self.walls[None, :, 1])
+            free &= ~(distance <= self.wall_clearance).any(1)
+        return free
+
+    def point_free(self, x, y):
+        return bool(self.points_free([(x, y)])[0])
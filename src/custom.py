@@ -4,8 +4,10 @@
 Baxter RSDK Inverse Kinematics Pick and Place Demo
 """
 import argparse
+import atexit
 import struct
 import sys
+import os
 import copy
 
 import rospy
@@ -27,6 +29,8 @@ from std_msgs.msg import (
     Empty,
 )
 
+from sensor_msgs.msg import JointState
+
 from baxter_core_msgs.srv import (
     SolvePositionIK,
     SolvePositionIKRequest,
@@ -34,9 +38,19 @@ from baxter_core_msgs.srv import (
 
 import baxter_interface
 
+import armsession
+from ikcache import IKCache, solve_path
+from trajectory import time_parameterize, execute
+
+# solutions for the poses every game reuses, shared by both arms and kept across launches
+IK_CACHE = IKCache(filename=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ik.pickle'))
+# written back once at exit rather than on every new solution
+atexit.register(IK_CACHE.flush)
+
 class PickAndPlace(object):
-    def __init__(self, limb, hover_distance = 0.15, verbose=True):
+    def __init__(self, limb, hover_distance = 0.15, verbose=True, ik_cache=None):
         self._limb_name = limb # string
+        self._ik_cache = ik_cache
         self._hover_distance = hover_distance # in meters
         self._verbose = verbose # bool
         self._limb = baxter_interface.Limb(limb)
@@ -61,36 +75,61 @@ class PickAndPlace(object):
         print("Running. Ctrl-c to quit")
 
     def ik_request(self, pose):
+        if self._ik_cache is None:
+            return self._solve_ik(pose)
+        return self._ik_cache.solve(self._limb_name, pose, self._solve_ik)
+
+    def _solve_ik(self, pose, seed=None):
+        return self.ik_request_batch([pose], [seed])[0]
+
+    def ik_request_batch(self, poses, seeds=None):
+        # all poses in one service call, a solution or False per pose
         hdr = Header(stamp=rospy.Time.now(), frame_id='base')
         ikreq = SolvePositionIKRequest()
-        ikreq.pose_stamp.append(PoseStamped(header=hdr, pose=pose))
+        for pose in poses:
+            ikreq.pose_stamp.append(PoseStamped(header=hdr, pose=pose))
+        if seeds and any(seeds):
+            current = self._limb.joint_angles()
+            for seed in seeds:
+                seed = seed or current
+                ikreq.seed_angles.append(JointState(header=hdr, name=list(seed.keys()),
+                                                    position=list(seed.values())))
+            # try the given seeds first, then the usual fallbacks
+            ikreq.seed_mode = ikreq.SEED_AUTO
         try:
             resp = self._iksvc(ikreq)
         except (rospy.ServiceException, rospy.ROSException), e:
             rospy.logerr("Service call failed: %s" % (e,))
-            return False
+            return [False]*len(poses)
         # Check if result valid, and type of seed ultimately used to get solution
         # convert rospy's string representation of uint8[]'s to int's
         resp_seeds = struct.unpack('<%dB' % len(resp.result_type), resp.result_type)
-        limb_joints = {}
-        if (resp_seeds[0] != resp.RESULT_INVALID):
-            seed_str = {
-                        ikreq.SEED_USER: 'User Provided Seed',
-                        ikreq.SEED_CURRENT: 'Current Joint Angles',
-                        ikreq.SEED_NS_MAP: 'Nullspace Setpoints',
-                       }.get(resp_seeds[0], 'None')
-            if self._verbose:
-                print("IK Solution SUCCESS - Valid Joint Solution Found from Seed Type: {0}".format(
-                         (seed_str)))
-            # Format solution into Limb API-compatible dictionary
-            limb_joints = dict(zip(resp.joints[0].name, resp.joints[0].position))
-            if self._verbose:
-                print("IK Joint Solution:\n{0}".format(limb_joints))
-                print("------------------")
-        else:
-            rospy.logerr("INVALID POSE - No Valid Joint Solution Found.")
-            return False
-        return limb_joints
+        solutions = []
+        for i in range(len(poses)):
+            if (resp_seeds[i] != resp.RESULT_INVALID):
+                seed_str = {
+                            ikreq.SEED_USER: 'User Provided Seed',
+                            ikreq.SEED_CURRENT: 'Current Joint Angles',
+                            ikreq.SEED_NS_MAP: 'Nullspace Setpoints',
+                           }.get(resp_seeds[i], 'None')
+                if self._verbose:
+                    print("IK Solution SUCCESS - Valid Joint Solution Found from Seed Type: {0}".format(
+                             (seed_str)))
+                # Format solution into Limb API-compatible dictionary
+                limb_joints = dict(zip(resp.joints[i].name, resp.joints[i].position))
+                if self._verbose:
+                    print("IK Joint Solution:\n{0}".format(limb_joints))
+                    print("------------------")
+                solutions.append(limb_joints)
+            else:
+                rospy.logerr("INVALID POSE - No Valid Joint Solution Found.")
+                solutions.append(False)
+        return solutions
+
+    def joint_path(self, poses):
+        # joints for every waypoint before moving, None if one is unreachable
+        return solve_path(self._limb_name, poses, self.ik_request_batch, self._solve_ik,
+                          self._limb.joint_angles(), self._ik_cache)
 
     def _guarded_move_to_joint_position(self, joint_angles):
         if joint_angles:
@@ -98,6 +137,14 @@ class PickAndPlace(object):
         else:
             rospy.logerr("No Joint Angles provided for move_to_joint_positions. Staying put.")
 
+    def follow_joint_path(self, joint_path, max_velocity=1.0, max_acceleration=2.0):
+        # one continuous motion through all solutions instead of a stop at each
+        trajectory = time_parameterize([self._limb.joint_angles()] + list(joint_path),
+                                       max_velocity, max_acceleration)
+        execute(self._limb, trajectory, now=rospy.get_time, sleep=rospy.sleep)
+        # settle on the last waypoint
+        self._guarded_move_to_joint_position(joint_path[-1])
+
     def gripper_open(self):
         self._gripper.open()
         #rospy.sleep(1.0)
@@ -262,94 +309,70 @@ def main():
     # left_arm._servo_to_pose(goal4)
     # left_arm.gripper_close()
 
-def run_plan(nodelist):
-    rospy.init_node("ik_pick_and_place_demo")
-    rospy.wait_for_message("/robot/sim/started", Empty)
-    hover_distance = 0.15 
-
-    overhead_orientation = Quaternion(
-                             x=-0.0249590815779,
-                             y=0.999649402929,
-                             z=0.00737916180073,
-                             w=0.00486450832011)
-
-
-
-    up = Pose(
-        position=Point(x = 0.4, y = 0.5, z=0.05),
-        orientation=overhead_orientation)
-
-    down = Pose(
-        position=Point(x = 0.4, y = 0.5, z=-0.1),
-        orientation=overhead_orientation)
-
+overhead_orientation = Quaternion(
+                         x=-0.0249590815779,
+                         y=0.999649402929,
+                         z=0.00737916180073,
+                         w=0.00486450832011)
 
-    lstarting_joint_angles = {'left_w0': 0.6699952259595108,
-                             'left_w1': 1.030009435085784,
-                             'left_w2': -0.4999997247485215,
-                             'left_e0': -1.189968899785275,
-                             'left_e1': 1.9400238130755056,
-                             'left_s0': -0.08000397926829805,
-                             'left_s1': -0.9999781166910306}
+lstarting_joint_angles = {'left_w0': 0.6699952259595108,
+                         'left_w1': 1.030009435085784,
+                         'left_w2': -0.4999997247485215,
+                         'left_e0': -1.189968899785275,
+                         'left_e1': 1.9400238130755056,
+                         'left_s0': -0.08000397926829805,
+                         'left_s1': -0.9999781166910306}
 
-    rstarting_joint_angles = {'right_w0': 0.6699952259595108,
-                             'right_w1': 1.030009435085784,
-                             'right_w2': -0.4999997247485215,
-                             'right_e0': -1.189968899785275,
-                             'right_e1': 1.9400238130755056,
-                             'right_s0': -0.08000397926829805,
-                             'right_s1': -0.9999781166910306}
+rstarting_joint_angles = {'right_w0': 0.6699952259595108,
+                         'right_w1': 1.030009435085784,
+                         'right_w2': -0.4999997247485215,
+                         'right_e0': -1.189968899785275,
+                         'right_e1': 1.9400238130755056,
+                         'right_s0': -0.08000397926829805,
+                         'right_s1': -0.9999781166910306}
 
-    left_arm = PickAndPlace('left', hover_distance)
-    right_arm = PickAndPlace('right', hover_distance)
 
-    left_arm.move_to_start(lstarting_joint_angles)
-    right_arm.move_to_start(rstarting_joint_angles)
+def overhead_pose(x, y, z):
+    return Pose(position=Point(x=x, y=y, z=z), orientation=overhead_orientation)
 
-    left_arm._servo_to_pose(down)
-    left_arm.gripper_close()  
-    left_arm._approach(up)
 
+class ArmSession(armsession.ArmSession):
+    """
+    ROS node and both arms, set up once and reused for every plan.
 
-    for i in range(0,len(nodelist)):
-        node_x, node_y = nodelist[i]
-        print node_x, node_y
+    The left arm moves the pieces; see armsession.ArmSession for solve,
+    execute and the submit/wait worker.
+    """
+    def __init__(self, hover_distance=0.15):
+        rospy.init_node("ik_pick_and_place_demo")
+        rospy.wait_for_message("/robot/sim/started", Empty)
 
-        pose = Pose(
-            position=Point(x = node_x, y = node_y, z=0.05),
-            orientation=overhead_orientation)
+        self.left_arm = PickAndPlace('left', hover_distance, ik_cache=IK_CACHE)
+        self.right_arm = PickAndPlace('right', hover_distance, ik_cache=IK_CACHE)
 
-        goal = Pose(
-            position=Point(x = node_x, y = node_y, z=-0.1),
-            orientation=overhead_orientation)
+        self.left_arm.move_to_start(lstarting_joint_angles)
+        self.right_arm.move_to_start(rstarting_joint_angles)
 
-        left_arm._approach(pose)
+        armsession.ArmSession.__init__(self, self.left_arm, overhead_pose, hover_distance,
+                                       log=rospy.logerr)
 
+    def close(self):
+        armsession.ArmSession.close(self)
+        IK_CACHE.flush()
 
-    up_end = Pose(
-        position=Point(x = node_x, y = node_y, z=0.05),
-        orientation=overhead_orientation)
 
-    down_end = Pose(
-        position=Point(x = node_x, y = node_y, z=-0.1),
-        orientation=overhead_orientation)
+_session = None
 
-    left_arm._servo_to_pose(down_end)
-    left_arm.gripper_open()  
-    left_arm._approach(up_end)
-
-    # if flag == 2:
-    #     left_arm.gripper_open()
-    #     left_arm._servo_to_pose(down)
-    #     left_arm.gripper_close()
-    #     left_arm._servo_to_pose(up)
-        
-    # left_arm._approach(pose)
-
-    # if flag == 1:
-    #     left_arm._servo_to_pose(goal)
-    #     left_arm.gripper_open()
-    
+def run_plan(nodelist):
+    """
+    Move a piece along nodelist and wait for it, for callers without a
+    session of their own; the session is shared. False if a waypoint is
+    unreachable, errors from the arm are raised.
+    """
+    global _session
+    if _session is None:
+        _session = ArmSession()
+    return _session.run(nodelist)
 
 
 if __name__ == '__main__':
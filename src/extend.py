@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+"""
+Sample, nearest-node and steering step of the RRT planners.
+
+Both generators yield (x, y, closest, draws) for every collision-free
+sample: the steered point, the id of the tree node it was steered from
+and how many samples were drawn for it, rejected ones included.
+
+extend() handles one sample at a time through the spatial index.
+extend_batch() draws k samples at once and does nearest neighbors,
+steering and point collision checks for the whole batch with NumPy. The
+survivors are yielded in draw order, and each one is re-checked against
+the nodes the planner inserted earlier in the same batch, so the tree
+grows exactly as if the samples had been processed one by one.
+"""
+from math import atan2, cos, sin
+
+import numpy as np
+
+
+def steer(x, y, parent_x, parent_y, epsilon):
+    theta = atan2(y - parent_y, x - parent_x)
+    return parent_x + epsilon*cos(theta), parent_y + epsilon*sin(theta)
+
+
+def extend(tree, nodes, checker, sample, epsilon):
+    draws = 0
+    while True:
+        x, y = sample()
+        draws += 1
+        closest = nodes.nearest(x, y)
+        if tree.distance_to_point(closest, x, y) > epsilon:
+            x, y = steer(x, y, tree.x[closest], tree.y[closest], epsilon)
+        if checker.point_free(x, y):
+            yield x, y, closest, draws
+            draws = 0
+
+
+def extend_batch(tree, nodes, checker, sample_batch, epsilon, k):
+    draws = 0
+    while True:
+        points = np.asarray(sample_batch(k), dtype=float).reshape(-1, 2)
+        first = len(tree)
+        # copies, the tree keeps growing while the batch is consumed
+        xs = np.array(tree.x, dtype=float)
+        ys = np.array(tree.y, dtype=float)
+        d2 = (points[:, 0, None] - xs[None, :])**2 + (points[:, 1, None] - ys[None, :])**2
+        closest = d2.argmin(1)
+        distance = np.sqrt(d2[np.arange(len(points)), closest])
+        theta = np.arctan2(points[:, 1] - ys[closest], points[:, 0] - xs[closest])
+        far = distance > epsilon
+        steered = np.where(far[:, None],
+                           np.column_stack([xs[closest] + epsilon*np.cos(theta),
+                                            ys[closest] + epsilon*np.sin(theta)]),
+                           points)
+        free = checker.points_free(steered)
+
+        for j in range(len(points)):
+            draws += 1
+            x, y = points[j]
+            parent = int(closest[j])
+            new_x, new_y = steered[j]
+            ok = free[j]
+            best = distance[j]
+            # nodes added since the batch was drawn may be closer
+            for node in range(first, len(tree)):
+                d = tree.distance_to_point(node, x, y)
+                if d < best:
+                    best = d
+                    parent = node
+            if parent != closest[j]:
+                new_x, new_y = x, y
+                if best > epsilon:
+                    new_x, new_y = steer(x, y, tree.x[parent], tree.y[parent], epsilon)
+                ok = checker.point_free(new_x, new_y)
+            if ok:
+                yield float(new_x), float(new_y), parent, draws
+                draws = 0
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+LRU cache of IK solutions keyed by limb and quantized pose.
+
+Every game sends the arm to the same few poses (the nine cells, the
+pick poses and the shared overhead orientation), so solving each of
+them once is enough. Poses are anything with position.x/y/z and
+orientation.x/y/z/w, rounded to resolution before they are used as a
+key. With a filename the cache is reloaded on startup and written back
+by flush(), not on every insert, so solving stays off the disk.
+
+solve_path() solves all waypoints of a plan at once: cached poses are
+looked up, the rest go to the IK service in one batched request, each
+seeded with the joints of the waypoint before it where those are known,
+and any the batch could not solve are retried one at a time seeded with
+the solution just before them.
+"""
+from lrucache import LRUCache
+
+
+class IKCache(LRUCache):
+
+    def __init__(self, capacity=256, filename=None, resolution=0.001):
+        LRUCache.__init__(self, capacity, filename, save_every=None)
+        self.resolution = resolution
+
+    def key(self, limb, pose):
+        position, orientation = pose.position, pose.orientation
+        return (limb,) + tuple(int(round(value/self.resolution)) for value in (
+            position.x, position.y, position.z,
+            orientation.x, orientation.y, orientation.z, orientation.w))
+
+    def get(self, limb, pose):
+        joints = self.lookup(self.key(limb, pose))
+        return None if joints == None else dict(joints)
+
+    def put(self, limb, pose, joints):
+        self.store(self.key(limb, pose), dict(joints))
+
+    def solve(self, limb, pose, service):
+        """Cached joints for pose, or service(pose) when they are not known yet."""
+        joints = self.get(limb, pose)
+        if joints == None:
+            joints = service(pose)
+            # failed solves are not cached, the pose may become reachable
+            if joints:
+                self.put(limb, pose, joints)
+        return joints
+
+
+def solve_path(limb, poses, solve_batch, solve_one, start=None, cache=None):
+    """
+    Joint solutions for every pose in order, or None if one is unreachable.
+
+    solve_batch(poses, seeds) returns a solution or False per pose,
+    solve_one(pose, seed) a single one; seeds may be None.
+    """
+    joints = [cache.get(limb, pose) if cache != None else None for pose in poses]
+    missing = [i for i, solution in enumerate(joints) if solution == None]
+    if missing:
+        seeds = []
+        for i in missing:
+            # nearest known solution before this waypoint
+            seed = start
+            for j in range(i - 1, -1, -1):
+                if joints[j] != None:
+                    seed = joints[j]
+                    break
+            seeds.append(seed)
+        for i, solution in zip(missing, solve_batch([poses[i] for i in missing], seeds)):
+            joints[i] = solution or None
+    for i, pose in enumerate(poses):
+        if joints[i] == None:
+            joints[i] = solve_one(pose, joints[i-1] if i > 0 else start) or None
+            if joints[i] == None:
+                return None
+        if cache != None and i in missing:
+            cache.put(limb, pose, joints[i])
+    return joints
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+"""
+Least-recently-used store with optional pickle persistence.
+
+Entries live in an OrderedDict, oldest first; a lookup moves its entry
+to the end and storing past capacity drops from the front. hits and
+misses count lookups. With a filename the entries are reloaded on
+startup and written back after every save_every stores (never, with
+None), and on flush(). Access is locked, the store may be shared between
+threads.
+"""
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+
+class LRUCache(object):
+
+    def __init__(self, capacity, filename=None, save_every=1):
+        self.capacity = capacity
+        self.filename = filename
+        self.save_every = save_every
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.unsaved = 0
+        self.lock = threading.RLock()
+        if filename != None and os.path.exists(filename):
+            with open(filename, 'rb') as data:
+                self.entries.update(pickle.load(data))
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def lookup(self, key):
+        with self.lock:
+            value = self.entries.pop(key, None)
+            if value == None:
+                self.misses += 1
+                return None
+            self.entries[key] = value
+            self.hits += 1
+            return value
+
+    def store(self, key, value):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = value
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+            self.unsaved += 1
+            if self.filename != None and self.save_every != None and self.unsaved >= self.save_every:
+                self.save()
+
+    def discard(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def save(self, filename=None):
+        filename = filename or self.filename
+        with self.lock:
+            with open(filename, 'wb') as data:
+                # protocol 2 so caches load under both python 2 and 3
+                pickle.dump(list(self.entries.items()), data, 2)
+            self.unsaved = 0
+
+    def flush(self):
+        with self.lock:
+            if self.filename != None and self.unsaved:
+                self.save()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Plan, IK and execution as overlapping stages.
+
+Each stage runs in its own thread and hands work to the next one through
+a bounded queue, so the next move can be planned and solved while the
+arm is still executing the last one, and a slow arm holds back planning
+instead of piling up plans. submit() returns a Ticket that follows the
+move through the stages.
+
+A ticket can be cancelled at any time, and valid(ticket) is asked again
+before IK and before execution, so a plan that no longer fits the board
+(say the board changed under it) is dropped before the arm moves.
+
+    pipeline = Pipeline(planner, session.solve, session.execute)
+    ticket = pipeline.submit(space)
+    ...
+    pipeline.close()
+"""
+import threading
+
+try:
+    import queue
+except ImportError:
+    # python 2
+    import Queue as queue
+
+PENDING, EXECUTING, DONE, CANCELLED, FAILED = 'pending', 'executing', 'done', 'cancelled', 'failed'
+
+
+class Ticket(object):
+
+    def __init__(self, job):
+        self.job = job
+        self.path = None
+        self.trajectory = None
+        self.state = PENDING
+        self.error = None
+        self.finished = threading.Event()
+        self.lock = threading.Lock()
+
+    def _advance(self, state):
+        # compare-and-set, so cancel() and the arm starting cannot both win
+        with self.lock:
+            if self.state != PENDING:
+                return False
+            self.state = state
+            return True
+
+    def cancel(self):
+        """Drop the move unless the arm has started it, True if it was dropped."""
+        return self._advance(CANCELLED)
+
+    @property
+    def cancelled(self):
+        return self.state == CANCELLED
+
+    def _finish(self, state, error=None):
+        with self.lock:
+            if self.state in (PENDING, EXECUTING):
+                self.state = state
+            self.error = error
+        self.finished.set()
+
+    def wait(self, timeout=None):
+        self.finished.wait(timeout)
+        return self.state
+
+
+class Pipeline(object):
+
+    def __init__(self, plan, solve, execute, size=2, valid=None):
+        self.valid = valid
+        self.tickets = []
+        self.lock = threading.Lock()
+        self.queues = [queue.Queue(size), queue.Queue(size), queue.Queue(size)]
+        self.threads = [threading.Thread(target=self._stage, args=args) for args in (
+            (self._plan, plan, self.queues[0], self.queues[1], False),
+            (self._solve, solve, self.queues[1], self.queues[2], True),
+            (self._execute, execute, self.queues[2], None, True))]
+        for thread in self.threads:
+            thread.daemon = True
+            thread.start()
+
+    def _plan(self, plan, ticket):
+        ticket.path = plan(ticket.job)
+        if not ticket.path:
+            raise ValueError('no plan for {!r}'.format(ticket.job))
+
+    def _solve(self, solve, ticket):
+        ticket.trajectory = solve(ticket.path)
+        if ticket.trajectory is None:
+            raise ValueError('unreachable waypoint in the plan for {!r}'.format(ticket.job))
+
+    def _execute(self, execute, ticket):
+        # past this point the move is no longer cancelled
+        if not ticket._advance(EXECUTING):
+            return
+        execute(ticket.path, ticket.trajectory)
+        ticket._finish(DONE)
+
+    def _stage(self, step, function, inbox, outbox, check):
+        while True:
+            ticket = inbox.get()
+            if ticket is None:
+                if outbox != None:
+                    outbox.put(None)
+                return
+            if check and not ticket.cancelled and self.valid != None and not self.valid(ticket):
+                ticket.cancel()
+            if ticket.cancelled:
+                ticket._finish(CANCELLED)
+                continue
+            try:
+                step(function, ticket)
+            except Exception as e:
+                ticket._finish(FAILED, e)
+                continue
+            if ticket.cancelled:
+                ticket._finish(CANCELLED)
+            elif outbox != None:
+                outbox.put(ticket)
+
+    def submit(self, job):
+        ticket = Ticket(job)
+        with self.lock:
+            self.tickets = [t for t in self.tickets if not t.finished.is_set()]
+            self.tickets.append(ticket)
+        self.queues[0].put(ticket)
+        return ticket
+
+    def cancel_all(self):
+        # the move being executed finishes, everything behind it is dropped
+        with self.lock:
+            for ticket in self.tickets:
+                ticket.cancel()
+
+    def wait(self):
+        with self.lock:
+            tickets = list(self.tickets)
+        for ticket in tickets:
+            ticket.wait()
+
+    def close(self):
+        self.queues[0].put(None)
+        for thread in self.threads:
+            thread.join()
@@ -0,0 +1,34 @@
+#!/usr/bin/env python
+"""
+LRU cache of planned paths keyed by goal cell and placed obstacles.
+
+There are nine goals and at most 2^9 sets of placed pieces, so repeated
+games keep asking for the same plans. Keys use the goal number and the
+obstacle centres rounded and sorted, so the order pieces were placed in
+does not matter. With a filename the cache is pickled to disk on every
+insert and reloaded on startup.
+"""
+from lrucache import LRUCache
+
+
+class PlanCache(LRUCache):
+
+    def __init__(self, capacity=512, filename=None):
+        LRUCache.__init__(self, capacity, filename)
+
+    @staticmethod
+    def key(tic, obstacles):
+        return tic, tuple(sorted((round(obstacle[0], 3), round(obstacle[1], 3))
+                                 for obstacle in obstacles))
+
+    def get(self, tic, obstacles):
+        plan = self.lookup(self.key(tic, obstacles))
+        if plan == None:
+            return None
+        return [list(point) for point in plan]
+
+    def put(self, tic, obstacles, plan):
+        self.store(self.key(tic, obstacles), [tuple(point) for point in plan])
+
+    def discard(self, tic, obstacles):
+        LRUCache.discard(self, self.key(tic, obstacles))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Recorder for the drawing calls the RRT planners make.
+
+Pass a PlanTrace to RRT(tic, render=False, trace=...) to plan at compute
+speed and still be able to look at the tree growth afterwards:
+
+    trace = PlanTrace()
+    path = RRT(6, render=False, trace=trace)
+    trace.replay(setup_space, 'tree.png')
+"""
+import matplotlib.pyplot as plt
+
+
+class PlanTrace(object):
+
+    def __init__(self):
+        self.goal = None
+        self.obstacles = []
+        self.events = []
+
+    def start(self, goal, obstacles):
+        # obstacles are copied, RRT() appends the goal once it is done
+        self.goal = list(goal)
+        self.obstacles = [list(obstacle) for obstacle in obstacles]
+        self.events = []
+
+    def plot(self, xs, ys, **style):
+        self.events.append(('plot', list(xs), list(ys), style))
+
+    def frame(self):
+        self.events.append(('frame',))
+
+    def frames(self):
+        return sum(1 for event in self.events if event[0] == 'frame')
+
+    def replay(self, setup_space, filename=None, interval=0):
+        """
+        Redraw the recorded plan on a figure from setup_space(goal, obstacles).
+
+        With an interval the growth is animated like a live run, otherwise
+        everything is drawn at once. The figure is saved when a filename
+        is given and returned either way.
+        """
+        figure = setup_space(self.goal, self.obstacles)
+        for event in self.events:
+            if event[0] == 'plot':
+                plt.plot(event[1], event[2], **event[3])
+            elif interval:
+                plt.pause(interval)
+        if filename != None:
+            figure.savefig(filename)
+        return figure
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Plan several goal cells at once in a process pool.
+
+While the human is thinking the placed obstacles are already known, so
+the learner's likely moves can be planned ahead on idle cores. Every job
+runs rtica.RRT headless with its own seed and the results land in a
+PlanCache, where rtica.cached_plan picks them up once the move is made.
+prefetch() and plan() may be called from different threads.
+
+    prefetcher = PlanPrefetcher(plans, anytime=True, max_iterations=2000)
+    prefetcher.prefetch([3, 5, 7], obstacles)
+    ...
+    path = prefetcher.plan(5, fallback)
+"""
+import multiprocessing
+import threading
+from random import Random
+
+import rtica
+
+
+def _plan(job):
+    # runs in a worker, obstacles are per job rather than shared module state
+    tic, placed, seed, options = job
+    return rtica.RRT(tic, render=False, seed=seed, placed=placed, **options)
+
+
+class PlanPrefetcher(object):
+
+    def __init__(self, cache, processes=None, seed=None, **options):
+        self.cache = cache
+        self.processes = processes
+        self.options = options
+        self.seeds = Random(seed)
+        self.pool = None
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def _jobs(self, tics, obstacles):
+        placed = [list(obstacle) for obstacle in obstacles]
+        return [(tic, placed, self.seeds.randrange(2**31), self.options) for tic in tics]
+
+    def _pool(self):
+        if self.pool == None:
+            self.pool = multiprocessing.Pool(self.processes)
+        return self.pool
+
+    def plan_many(self, tics, obstacles):
+        """Plan every tic against obstacles in parallel and wait for all of them."""
+        jobs = self._jobs(tics, obstacles)
+        plans = self._pool().map(_plan, jobs)
+        for (tic, placed, seed, options), final_list in zip(jobs, plans):
+            if final_list:
+                self.cache.put(tic, placed, final_list)
+        return dict(zip(tics, plans))
+
+    def prefetch(self, tics, obstacles):
+        """Start planning the tics that are neither cached nor already running."""
+        with self.lock:
+            pool = self._pool()
+            for job in self._jobs(tics, obstacles):
+                key = self.cache.key(job[0], job[1])
+                if key in self.pending or key in self.cache:
+                    continue
+                self.pending[key] = (job, pool.apply_async(_plan, (job,)))
+
+    def collect(self, tic=None, obstacles=None):
+        """
+        Move finished plans into the cache.
+
+        With a tic the plan for it against obstacles is waited for if it
+        is still running, the rest are only taken when already done.
+        """
+        with self.lock:
+            running = None if tic == None else self.pending.get(self.cache.key(tic, obstacles))
+        if running != None:
+            # waited for outside the lock so prefetch() is not held up
+            running[1].wait()
+        with self.lock:
+            for key, (job, result) in list(self.pending.items()):
+                if not result.ready():
+                    continue
+                del self.pending[key]
+                if result.successful() and result.get():
+                    self.cache.put(job[0], job[1], result.get())
+
+    def plan(self, tic, planner=None, placed=None):
+        """Plan for tic against placed, or the board in rtica.obstacles."""
+        self.collect(tic, rtica.obstacles if placed == None else placed)
+        return rtica.cached_plan(tic, self.cache, planner, placed)
+
+    def close(self):
+        with self.lock:
+            if self.pool != None:
+                self.pool.terminate()
+                self.pool.join()
+                self.pool = None
+            self.pending = {}
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Dense Q-table for the tic-tac-toe learners.
+
+Values live in a (3^9, 9) float array indexed by the base-3 board code
+and the move (1-9) minus one, so a lookup is two integer indexes and
+reads never insert anything. Every entry starts at the same optimistic
+value the dict-based table used for unseen pairs.
+
+With symmetry=True rotations and reflections of a board share a row:
+boards are mapped to their canonical representative (see board.py) and
+moves follow along, leaving 2862 rows instead of 19683.
+
+save() writes a 32 byte header (magic, format version, symmetry flag,
+shape, initial value and a CRC-32 of the values) followed by the values
+as little-endian doubles. load() checks the header and the checksum and
+memory-maps the values copy-on-write, so a trained policy is ready at
+once and further learning never touches the file.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+from board import STATES, CANONICAL, TRANSFORM, ACTIONS, encode
+
+MAGIC = b'QTBL'
+VERSION = 1
+HEADER = struct.Struct('<4sHBxIIdI4x')
+
+
+class QTable(object):
+
+    def __init__(self, initial=1.0, symmetry=False):
+        self.initial = initial
+        self.symmetry = symmetry
+        if symmetry:
+            # compact row per canonical board
+            canonical, self.rows = np.unique(CANONICAL, return_inverse=True)
+            self.values = np.full((len(canonical), 9), initial)
+        else:
+            self.values = np.full((STATES, 9), initial)
+
+    def __len__(self):
+        # pairs that were ever updated
+        return int(np.count_nonzero(self.values != self.initial))
+
+    def locate(self, codes, actions):
+        """Row and column of (board code, move) pairs, arrays or scalars."""
+        cells = np.asarray(actions, dtype=int) - 1
+        if not self.symmetry:
+            return codes, cells
+        return self.rows[codes], ACTIONS[TRANSFORM[codes], cells]
+
+    def get(self, grid, action):
+        return float(self.values[self.locate(encode(grid), action)])
+
+    def set(self, grid, action, value):
+        self.values[self.locate(encode(grid), action)] = value
+
+    def q_values(self, grid, actions):
+        return self.values[self.locate(encode(grid), actions)]
+
+    def save(self, filename):
+        values = np.ascontiguousarray(self.values, dtype='<f8')
+        data = values.tobytes()
+        with open(filename, 'wb') as table:
+            table.write(HEADER.pack(MAGIC, VERSION, self.symmetry, values.shape[0],
+                                    values.shape[1], self.initial, zlib.crc32(data) & 0xffffffff))
+            table.write(data)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as table:
+            header = table.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError('{} is not a Q-table file'.format(filename))
+        magic, version, symmetry, rows, columns, initial, crc = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError('{} is not a Q-table file'.format(filename))
+        if version != VERSION:
+            raise ValueError('{} has Q-table format {}, expected {}'.format(filename, version, VERSION))
+        q = cls(initial, bool(symmetry))
+        if q.values.shape != (rows, columns):
+            raise ValueError('{} holds a {}x{} table, expected {}x{}'.format(
+                filename, rows, columns, *q.values.shape))
+        values = np.memmap(filename, dtype='<f8', mode='c', offset=HEADER.size, shape=(rows, columns))
+        if zlib.crc32(values.tobytes()) & 0xffffffff != crc:
+            raise ValueError('{} is corrupt, checksum mismatch'.format(filename))
+        q.values = values
+        return q
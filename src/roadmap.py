@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""
+Precomputed probabilistic roadmap (PRM) for the fixed start and goal cells.
+
+The start and the nine goals never move, only the pieces placed on the
+board change between moves. The roadmap is built once without obstacles,
+saved to disk and then queried per move. Edges are checked against the
+placed pieces lazily: only edges on a candidate shortest path are tested,
+and blocked ones are remembered until the obstacles change.
+
+Node 0 is the start and node i is goal i, so goal cells are looked up
+with the same tic number get_goal() takes.
+"""
+import heapq
+from math import sqrt
+
+import numpy as np
+
+from collision import CollisionChecker
+
+
+class Roadmap(object):
+
+    def __init__(self, points, edges):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.edges = np.asarray(edges, dtype=int).reshape(-1, 2)
+        self.adjacent = [[] for _ in range(len(self.points))]
+        for i, j in self.edges:
+            i, j = int(i), int(j)
+            weight = float(np.hypot(*(self.points[i] - self.points[j])))
+            self.adjacent[i].append((j, weight))
+            self.adjacent[j].append((i, weight))
+        self._signature = None
+        self._checked = {}
+
+    @classmethod
+    def build(cls, start, goals, samples=400, connect=20, width=150, length=150, seed=0):
+        rng = np.random.RandomState(seed)
+        points = np.vstack([np.array([start], dtype=float),
+                            np.array(goals, dtype=float),
+                            rng.random_sample((samples, 2))*[width, length]])
+        distance = np.sqrt(((points[:, None, :] - points[None, :, :])**2).sum(-1))
+        i, j = np.nonzero(np.triu(distance <= connect, 1))
+        return cls(points, np.column_stack([i, j]))
+
+    def save(self, filename):
+        np.savez(filename, points=self.points, edges=self.edges)
+
+    @classmethod
+    def load(cls, filename):
+        data = np.load(filename)
+        return cls(data['points'], data['edges'])
+
+    @classmethod
+    def load_or_build(cls, filename, start, goals, **options):
+        try:
+            return cls.load(filename)
+        except IOError:
+            roadmap = cls.build(start, goals, **options)
+            roadmap.save(filename)
+            return roadmap
+
+    def _reset(self, obstacles, clearance):
+        signature = (tuple(tuple(obstacle[:2]) for obstacle in obstacles), clearance)
+        if signature != self._signature:
+            self._signature = signature
+            self._checked = {}
+
+    def _search(self, source, target):
+        # A* over the edges not yet known to be blocked
+        goal = self.points[target]
+        best = {source: 0.0}
+        parent = {source: None}
+        queue = [(0.0, 0.0, source)]
+        while queue:
+            estimate, cost, node = heapq.heappop(queue)
+            if node == target:
+                path = []
+                while node != None:
+                    path.append(node)
+                    node = parent[node]
+                return path[::-1]
+            if cost > best[node]:
+                continue
+            for neighbor, weight in self.adjacent[node]:
+                if not self._checked.get((min(node, neighbor), max(node, neighbor)), True):
+                    continue
+                new_cost = cost + weight
+                if new_cost < best.get(neighbor, float('inf')):
+                    best[neighbor] = new_cost
+                    parent[neighbor] = node
+                    x, y = self.points[neighbor]
+                    heuristic = sqrt((x - goal[0])**2 + (y - goal[1])**2)
+                    heapq.heappush(queue, (new_cost + heuristic, new_cost, neighbor))
+        return None
+
+    def path(self, tic, obstacles, clearance):
+        """
+        Shortest collision-free path from the start to goal tic.
+
+        Returns the (x, y) waypoints from start to goal, or None when the
+        placed obstacles cut the goal off on this roadmap.
+        """
+        self._reset(obstacles, clearance)
+        checker = CollisionChecker(obstacles, clearance)
+        while True:
+            nodes = self._search(0, tic)
+            if nodes == None:
+                return None
+            edges = [(min(a, b), max(a, b)) for a, b in zip(nodes[:-1], nodes[1:])]
+            unchecked = [edge for edge in edges if edge not in self._checked]
+            if unchecked:
+                free = checker.edges_free([self.points[a] for a, b in unchecked],
+                                          [self.points[b] for a, b in unchecked])
+                for edge, ok in zip(unchecked, free):
+                    self._checked[edge] = bool(ok)
+            if all(self._checked[edge] for edge in edges):
+                return [tuple(self.points[node]) for node in nodes]
@@ -1,8 +1,16 @@
 #!/usr/bin/env python
 from math import sqrt,pi, cos, sin, atan2
-from random import random
+from random import random, Random
+import time
 import matplotlib.pyplot as plt
+import numpy as np
 from numpy import linspace
+from spatial import make_index
+from collision import CollisionChecker, BOARD_LINES
+from sampling import make_sampler
+from extend import extend, extend_batch, steer
+from tree import Tree, NONE
+from smoothing import smooth as smooth_path
 
 WIDTH = 150
 LENGTH = 150
@@ -22,6 +30,9 @@ start = [START_X,START_Y]
 GOAL_X, GOAL_Y = 0,50
 RADIUS = 6
 radius=18
+wall_clearance = 1.5
+# time.monotonic is python 3 only
+clock = getattr(time, 'monotonic', time.time)
 
 
 ## Import goals
@@ -129,35 +140,31 @@ def get_goal(tic):
 
 
 def collision(new_node,obstacles):
-    for i in range(len(obstacles)):
-        dist_obs = sqrt(pow(new_node.x-obstacles[i][0],2)+pow(new_node.y-obstacles[i][1],2))
-        if dist_obs <= radius+1: #or new_node[0] <= 0 or new_node[0] >= width or new_node[1] <= 0 or new_node[1] >= length:
-            collision_flag = 1
-            return collision_flag
-        # if newnode[0] <= 0 or newnode[0] >= width or newnode[1] <= 0 or newnode[1] >= length:
-        #     collision_flag = 1
-            #return collision_flag
-        else:
-            collision_flag = 0
+    if not CollisionChecker(obstacles, radius+1).point_free(new_node.x, new_node.y):
+        return 1
+    return 0
 
 
 
-def setup_space(goal):
+def setup_space(goal, placed=None):
+    if placed == None:
+        placed = obstacles
     figure, ax = plt.subplots(facecolor='white')
     ax.set_ylim((0,LENGTH))
     ax.set_xlim((0,WIDTH))
     plt.xlim()
     plt.ylim()
     plt.title(TITLE)
-    ax.set_axis_bgcolor('white')
+    # set_axis_bgcolor was renamed set_facecolor in matplotlib 2.0
+    (getattr(ax, 'set_facecolor', None) or ax.set_axis_bgcolor)('white')
     start_n = plt.Circle((start[0],start[1]),1, color = 'aqua')
     goal_n = plt.Circle((goal[0],goal[1]),goal[2], color = 'green')
     ax.add_artist(start_n)
     ax.add_artist(goal_n)
 
     plot_goals = []
-    for l in range(len(obstacles)):
-        plot_obstacles=plt.Circle((obstacles[l][0],obstacles[l][1]),18,color='red')
+    for l in range(len(placed)):
+        plot_obstacles=plt.Circle((placed[l][0],placed[l][1]),18,color='red')
         ax.add_artist(plot_obstacles)               
     for k in range(len(goals)):
         plot_goals = plt.Circle((goals[k][0], goals[k][1]), 2, color='black')
@@ -177,73 +184,174 @@ def mapping(OldMax, OldMin, NewMax, NewMin, OldValue):
     NewValue = (((OldValue - OldMin) * NewRange) / OldRange) + NewMin
     return NewValue
 
+def robot_coordinates(x, y):
+    # planner space to the [x, y] the arm is sent to in run_plan
+    new_x = mapping(150, 0, 0.5, 0, x)
+    new_y = mapping(150, 0, 0.8, 0.4, y)
+    return [new_y, new_x]
+
+
+def planar_coordinates(point):
+    # inverse of robot_coordinates
+    new_y, new_x = point
+    return mapping(0.5, 0, 150, 0, new_x), mapping(0.8, 0.4, 150, 0, new_y)
+
+
+def cached_plan(tic, cache, planner=None, placed=None):
+    # reuse the plan for this goal and set of placed pieces if it still clears them
+    # placed defaults to the board in obstacles, which then gets the new piece
+    goal = get_goal(tic)
+    board = obstacles if placed == None else placed
+    final_list = cache.get(tic, board)
+    if final_list != None:
+        points = [planar_coordinates(point) for point in final_list]
+        checker = CollisionChecker(board, radius+1)
+        if checker.edges_free(points[:-1], points[1:]).all():
+            if placed == None:
+                obstacles.append(goal)
+            return final_list
+        cache.discard(tic, board)
+    before = list(board)
+    final_list = (planner or RRT)(tic, placed=placed)
+    if final_list:
+        cache.put(tic, before, final_list)
+    return final_list
+
+
+def PRM(tic, roadmap, smooth=False, spacing=None, placed=None, **options):
+    # answer a move from a prebuilt Roadmap, RRT() only runs if it has no path
+    goal = get_goal(tic)
+    board = obstacles if placed == None else placed
+    points = roadmap.path(tic, board, radius+1)
+    if points == None:
+        return RRT(tic, smooth=smooth, spacing=spacing, placed=placed, **options)
+    if smooth:
+        points = smooth_path(points, CollisionChecker(board, radius+1), spacing)
+    final_list = [robot_coordinates(x, y) for x, y in reversed(points)]
+    if placed == None:
+        obstacles.append(goal)
+    return final_list
 
-def RRT(tic):
+
+def RRT(tic, index='grid', render=True, trace=None, walls=False, batch=None, seed=None,
+        max_iterations=None, stats=None, sampler='uniform', goal_bias=0.05, box=None,
+        anytime=False, time_budget=None, smooth=False, spacing=None, placed=None):
     ##Define Initial Parameters
+    # plans against placed instead of the board in obstacles when given,
+    # and only the board in obstacles gets the new piece appended
+    # anytime keeps rewiring past the first solution until the budget runs out
+    if anytime and max_iterations == None and time_budget == None:
+        raise ValueError('anytime planning needs max_iterations or time_budget')
     goal = get_goal(tic)
-    figure = setup_space(goal)
-    start_node = Node(START_X,START_Y)
-    goal_node = Node(goal[0],goal[1])
-    current_node = start_node
-    figure, plt.plot([0,100], [33, 33], color = 'black', linewidth = 3)
-    figure, plt.plot([0,100], [66, 66], color = 'black', linewidth = 3)
-    figure, plt.plot([33,33], [0, 100], color = 'black', linewidth = 3)
-    figure, plt.plot([66,66], [0, 100], color = 'black', linewidth = 3)
-   # print('Distance to goal is {}'.format(current_node.distance_to(goal_node)))
-    nodes = []
-    nodes2 = []
+    board = obstacles if placed == None else placed
+    if render:
+        figure = setup_space(goal, board)
+    if trace != None:
+        trace.start(goal, board)
+
+    def draw(xs, ys, **style):
+        if render:
+            plt.plot(xs, ys, **style)
+        if trace != None:
+            trace.plot(xs, ys, **style)
+
+    draw([0,100], [33, 33], color = 'black', linewidth = 3)
+    draw([0,100], [66, 66], color = 'black', linewidth = 3)
+    draw([33,33], [0, 100], color = 'black', linewidth = 3)
+    draw([66,66], [0, 100], color = 'black', linewidth = 3)
+    # the board lines only become walls on request, they box in the middle cell
+    checker = CollisionChecker(board, radius+1, BOARD_LINES if walls else (), wall_clearance)
+    # nodes are ids into the array-backed tree, the index only stores ids
+    tree = Tree()
+    nodes = make_index(index, neighborhood)
     final_list = []
-    nodes.append(start_node)
-    nodes2.append(start_node)
-
-    ##Setup plots
+    current = tree.add(START_X, START_Y)
+    nodes.insert(current, START_X, START_Y)
+    # the whole space unless a tighter workspace box is given
+    sampler = make_sampler(sampler, box or (0, 0, WIDTH, LENGTH), start, goal, goal_bias)
+    if batch:
+        # k samples per step through NumPy, reproducible for a given seed
+        rng = np.random.RandomState(seed)
+        candidates = extend_batch(tree, nodes, checker,
+                                  lambda k: sampler.sample_batch(rng, k), EPSILON, batch)
+    else:
+        rand = Random(seed).random if seed != None else random
+        candidates = extend(tree, nodes, checker, lambda: sampler.sample(rand), EPSILON)
+    goal_check2 = float('inf')
+    plain_parent, new_x2, new_y2 = current, START_X, START_Y
+    solutions = []
+    best = None
+    curve = []
+    begin = clock()
 
     #main loop
-    while current_node.distance_to(goal_node) > goal[2]: 
-        neighbors = []
-        new_node = Node(random()*WIDTH, random()*LENGTH)
-        #print(new_node)
-        closest_node = new_node.closest2(nodes)
-       # print('distance to parent is {}'.format(new_node.distance_to(parent)))
-        if new_node.distance_to(closest_node) > EPSILON:
-            #print('Too Long')
-            new_node = get_theta_node(new_node,closest_node)
-            #print('new distance to parent is {}'.format(new_node.distance_to(parent)))
-        new_node2 = new_node
-        for node in nodes:
-            if node.distance_to(new_node) < neighborhood:
-                neighbors.append(node)
-        collision_flag=0
-        collision_flag=collision(new_node,obstacles)
-        if(collision_flag==1):
+    iterations = 0
+    samples = 0
+    while anytime or tree.distance_to_point(current, goal[0], goal[1]) > goal[2]:
+        if anytime:
+            # the budget is checked first, nothing is taken once it has run out
+            elapsed = clock() - begin
+            if time_budget != None and elapsed >= time_budget:
+                break
+            # costs of earlier solutions drop as the tree gets rewired
+            if solutions:
+                best = min(solutions, key=lambda node: tree.cost[node])
+                if not curve or tree.cost[best] < curve[-1][2]:
+                    curve.append((elapsed, iterations, tree.cost[best]))
+                    sampler.update(tree.cost[best])
+            if max_iterations != None and iterations >= max_iterations:
+                break
+        elif max_iterations != None and iterations >= max_iterations:
+            # give up without placing the piece
+            if stats != None:
+                stats.update(iterations=iterations, samples=samples, nodes=len(tree), cost=None)
+            return None
+        iterations += 1
+        new_x, new_y, closest, drawn = next(candidates)
+        samples += drawn
+        closest_x, closest_y = tree.x[closest], tree.y[closest]
+        # the plain RRT step, kept to compare path lengths
+        new_x2, new_y2 = new_x, new_y
+        neighbors = nodes.near(new_x, new_y, neighborhood)
+        # only neighbors with a clear edge to the new node can be its parent
+        free = checker.edges_free([(tree.x[node], tree.y[node]) for node in neighbors],
+                                  [(new_x, new_y)]*len(neighbors))
+        parents = [node for node, ok in zip(neighbors, free) if ok]
+        if not parents:
             continue
-        
-        best_parent = new_node.optimal(neighbors)
 
+        best_parent = min(parents, key=lambda node: tree.cost[node] + tree.distance_to_point(node, new_x, new_y))
+        parent_x, parent_y = tree.x[best_parent], tree.y[best_parent]
 
-        if new_node.distance_to(best_parent) > EPSILON:
-            #print('Too Long')
-            new_node = get_theta_node(new_node,best_parent)
+        if tree.distance_to_point(best_parent, new_x, new_y) > EPSILON:
+            new_x, new_y = steer(new_x, new_y, parent_x, parent_y, EPSILON)
 
-        figure, plt.plot([new_node.x, best_parent.x], [new_node.y, best_parent.y], color = 'blue',linewidth = 1.5)
-        #figure, plt.plot([new_node2.x, closest_node.x], [new_node2.y, closest_node.y], color = 'magenta',linewidth = 1, alpha = .9)
-        plt.pause(0.0001)
-       
-        
-        current_node = Node(new_node.x, new_node.y, parent = best_parent)
-        current_node2 = Node(new_node2.x, new_node2.y, parent = closest_node)
-        nodes.append(current_node)
-        nodes2.append(current_node2)
+        draw([new_x, parent_x], [new_y, parent_y], color = 'blue',linewidth = 1.5)
+        if render:
+            plt.pause(0.0001)
+        if trace != None:
+            trace.frame()
+
+        current = tree.add(new_x, new_y, best_parent)
+        nodes.insert(current, new_x, new_y)
+        plain_parent = closest
         super_flag = False
-        for node in neighbors:
-            if node.parent != None:
-                if node.cost_to_start() >= current_node.self_cost_to_start_through_node(node):
-                    index = nodes.index(node)
-                    figure, plt.plot([node.x, node.parent.x], [node.y, node.parent.y], color = 'white',linewidth = 1.51)
-                    nodes[index] = Node(node.x,node.y, parent = current_node)
-                    figure, plt.plot([new_node.x, node.x], [new_node.y, node.y], color = 'blue',linewidth = 1.5)
-                    half_way1=((new_node.x+node.x)/2,(new_node.y+node.y)/2)
+        rewire_free = checker.edges_free([(tree.x[node], tree.y[node]) for node in neighbors],
+                                         [(new_x, new_y)]*len(neighbors))
+        for node, ok in zip(neighbors, rewire_free):
+            if ok and tree.parent[node] != NONE:
+                node_x, node_y = tree.x[node], tree.y[node]
+                if tree.cost[node] > tree.cost[current] + tree.distance(current, node):
+                    old_parent = tree.parent[node]
+                    draw([node_x, tree.x[old_parent]], [node_y, tree.y[old_parent]], color = 'white',linewidth = 1.51)
+                    tree.set_parent(node, current)
+                    draw([new_x, node_x], [new_y, node_y], color = 'blue',linewidth = 1.5)
+                    half_way1=((new_x+node_x)/2,(new_y+node_y)/2)
                     goal_check1=sqrt(pow(half_way1[0]-goal[0],2)+pow(half_way1[1]-goal[1],2))
+                    if anytime:
+                        if goal_check1<goal[2] or tree.distance_to_point(node, goal[0], goal[1]) <= goal[2]:
+                            solutions.append(node)
+                        continue
                     if goal_check1<goal[2] or goal_check2<goal[2] :
                         super_flag = True
                         break
@@ -251,36 +359,46 @@ def RRT(tic):
 
         if super_flag == True:
             break
-        half_way1=((new_node.x+best_parent.x)/2,(new_node.y+best_parent.y)/2)
-        half_way2=((new_node2.x+closest_node.x)/2,(new_node2.y+closest_node.y)/2)
+        half_way1=((new_x+parent_x)/2,(new_y+parent_y)/2)
+        half_way2=((new_x2+closest_x)/2,(new_y2+closest_y)/2)
         goal_check1=sqrt(pow(half_way1[0]-goal[0],2)+pow(half_way1[1]-goal[1],2))
         goal_check2=sqrt(pow(half_way2[0]-goal[0],2)+pow(half_way2[1]-goal[1],2))
+        if anytime:
+            if goal_check1<goal[2] or tree.distance_to_point(current, goal[0], goal[1]) <= goal[2]:
+                solutions.append(current)
+            continue
         if goal_check1<goal[2] or goal_check2<goal[2] :
             break
         #input("hi")
-    path = current_node.path_to_start()
-    path2 = current_node2.path_to_start()
-    length1 = current_node.cost_to_start()
-    length2 = current_node2.cost_to_start()
+    if anytime:
+        if stats != None:
+            stats.update(curve=curve)
+        if best == None:
+            if stats != None:
+                stats.update(iterations=iterations, samples=samples, nodes=len(tree), cost=None)
+            return None
+        current = best
+    if stats != None:
+        stats.update(iterations=iterations, samples=samples, nodes=len(tree), cost=tree.cost[current])
+    path = tree.node(current).path_to_start()
+    length1 = tree.cost[current]
+    length2 = tree.path_cost(plain_parent) + tree.distance_to_point(plain_parent, new_x2, new_y2)
     # print 'RRT* path length is {}'.format(length1)
     # print'RRT path length is {}'.format(length2)
     for node in path:
         if node.parent != None:
-            new_x = mapping(150, 0, 0.5, 0, node.parent.x)
-            new_y = mapping(150, 0, 0.8, 0.4, node.parent.y)
-            final_list.append([new_y, new_x])
-            figure, plt.plot([node.x, node.parent.x], [node.y, node.parent.y], color = 'cyan', linewidth = 3)
+            final_list.append(robot_coordinates(node.parent.x, node.parent.y))
+            draw([node.x, node.parent.x], [node.y, node.parent.y], color = 'cyan', linewidth = 3)
             #continue
         else:
             continue  
-    for node in path2:
-        if node.parent != None:
-            continue
-            #figure, plt.plot([node.x, node.parent.x], [node.y, node.parent.y], color = 'orange',linewidth = 2)
-        else:
-            continue  
-    new_obstacles=goal
-    obstacles.append(new_obstacles)
+    if smooth:
+        # fewer waypoints, each one saves an IK call and a stop of the arm
+        points = smooth_path([(node.x, node.y) for node in path[1:]], checker, spacing)
+        final_list = [robot_coordinates(x, y) for x, y in points]
+    if placed == None:
+        new_obstacles=goal
+        obstacles.append(new_obstacles)
     return final_list
 
 
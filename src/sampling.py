@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Sampling strategies for the RRT planners.
+
+    uniform   every sample uniform over the workspace box
+    goal      like uniform, but returns the goal itself with probability goal_bias
+    informed  uniform until a path of cost c_best is known, then uniform over
+              the ellipse with the start and goal as foci and c_best as the
+              major axis, the only region that can still shorten the path
+
+Samplers draw single points from a random() callable and batches from a
+NumPy RandomState, and are told about better paths through update(cost).
+"""
+from math import sqrt, pi, cos, sin, atan2
+
+import numpy as np
+
+
+class UniformSampler(object):
+
+    def __init__(self, box):
+        self.box = box
+
+    def sample(self, rand):
+        xmin, ymin, xmax, ymax = self.box
+        return xmin + rand()*(xmax - xmin), ymin + rand()*(ymax - ymin)
+
+    def sample_batch(self, rng, k):
+        xmin, ymin, xmax, ymax = self.box
+        return [xmin, ymin] + rng.random_sample((k, 2))*[xmax - xmin, ymax - ymin]
+
+    def update(self, cost):
+        pass
+
+
+class GoalBiasedSampler(UniformSampler):
+
+    def __init__(self, box, goal, goal_bias=0.05):
+        UniformSampler.__init__(self, box)
+        self.goal = (goal[0], goal[1])
+        self.goal_bias = goal_bias
+
+    def sample(self, rand):
+        if rand() < self.goal_bias:
+            return self.goal
+        return UniformSampler.sample(self, rand)
+
+    def sample_batch(self, rng, k):
+        points = UniformSampler.sample_batch(self, rng, k)
+        points[rng.random_sample(k) < self.goal_bias] = self.goal
+        return points
+
+
+class InformedSampler(UniformSampler):
+
+    def __init__(self, box, start, goal):
+        UniformSampler.__init__(self, box)
+        self.start = (start[0], start[1])
+        self.goal = (goal[0], goal[1])
+        self.c_min = sqrt((goal[0] - start[0])**2 + (goal[1] - start[1])**2)
+        self.angle = atan2(goal[1] - start[1], goal[0] - start[0])
+        self.centre = ((start[0] + goal[0])/2.0, (start[1] + goal[1])/2.0)
+        self.c_best = None
+
+    def update(self, cost):
+        if cost != None and (self.c_best == None or cost < self.c_best):
+            self.c_best = max(cost, self.c_min)
+
+    def _axes(self):
+        return self.c_best/2.0, sqrt(self.c_best**2 - self.c_min**2)/2.0
+
+    def _inside_box(self, x, y):
+        xmin, ymin, xmax, ymax = self.box
+        return (x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)
+
+    def sample(self, rand):
+        if self.c_best == None:
+            return UniformSampler.sample(self, rand)
+        a, b = self._axes()
+        while True:
+            r, theta = sqrt(rand()), 2*pi*rand()
+            ex, ey = a*r*cos(theta), b*r*sin(theta)
+            x = self.centre[0] + ex*cos(self.angle) - ey*sin(self.angle)
+            y = self.centre[1] + ex*sin(self.angle) + ey*cos(self.angle)
+            if self._inside_box(x, y):
+                return x, y
+
+    def sample_batch(self, rng, k):
+        if self.c_best == None:
+            return UniformSampler.sample_batch(self, rng, k)
+        a, b = self._axes()
+        points = np.empty((0, 2))
+        while len(points) < k:
+            r = np.sqrt(rng.random_sample(k))
+            theta = 2*pi*rng.random_sample(k)
+            ex, ey = a*r*np.cos(theta), b*r*np.sin(theta)
+            x = self.centre[0] + ex*cos(self.angle) - ey*sin(self.angle)
+            y = self.centre[1] + ex*sin(self.angle) + ey*cos(self.angle)
+            inside = self._inside_box(x, y)
+            points = np.vstack([points, np.column_stack([x[inside], y[inside]])])
+        return points[:k]
+
+
+SAMPLERS = ('uniform', 'goal', 'informed')
+
+
+def make_sampler(kind, box, start, goal, goal_bias=0.05):
+    if kind == 'uniform':
+        return UniformSampler(box)
+    if kind == 'goal':
+        return GoalBiasedSampler(box, goal, goal_bias)
+    if kind == 'informed':
+        return InformedSampler(box, start, goal)
+    raise ValueError('unknown sampler {!r}, expected one of {}'.format(kind, list(SAMPLERS)))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+"""
+Batched self-play for training the Q-learners.
+
+N games are stepped at once as an (N, 9) array of cells, 0 empty, 1 X,
+2 O. Wins are tested against the 8 win lines for every game in one go,
+moves are picked epsilon-greedy from whole rows of the Q arrays, and
+the updates are the ones Q_Learner.reward makes in TTT.play_game: after
+each ply the waiting player learns from its last move with reward 0,
+and when a game ends both players learn from +1/-1 or 0/0.
+
+All games of a batch are updated together, so when several games hit
+the same state and move in the same ply only one of the updates is
+kept. Small batches stay closest to playing the games one by one.
+
+    BatchSelfPlay(player1.q, player2.q).train(100000)
+
+train_parallel() runs that on several processes. Every round each worker
+starts from the master tables in shared memory, trains on its own share
+of the games, and the master becomes the average of the worker tables.
+
+    train_parallel(player1.q, player2.q, 1000000, report=print_progress)
+"""
+import multiprocessing
+import time
+
+import numpy as np
+
+from board import LINES, encode_batch
+from qtable import QTable
+
+LINE_CELLS = np.array(LINES)
+MOVES = np.arange(1, 10)
+
+
+def wins(boards, mark):
+    return (boards[:, LINE_CELLS] == mark).all(2).any(1)
+
+
+def full(boards):
+    return (boards != 0).all(1)
+
+
+class BatchSelfPlay(object):
+
+    def __init__(self, q_x, q_o, epsilon=0.2, alpha=0.3, gamma=0.9, seed=None):
+        self.tables = (q_x, q_o)
+        # one epsilon for both players or an (X, O) pair
+        self.epsilon = epsilon if isinstance(epsilon, (tuple, list)) else (epsilon, epsilon)
+        self.alpha = alpha
+        self.gamma = gamma
+        self.rng = np.random.RandomState(seed)
+
+    def _row_values(self, q, codes):
+        return q.values[q.locate(codes[:, None], MOVES[None, :])]
+
+    def _choose(self, q, epsilon, codes, free):
+        values = np.where(free, self._row_values(q, codes), -np.inf)
+        best = values == values.max(1)[:, None]
+        explore = self.rng.random_sample(len(codes)) < epsilon
+        # random tie break among the best moves, or among all free ones
+        candidates = np.where(explore[:, None], free, best)
+        return (self.rng.random_sample(free.shape)*candidates).argmax(1)
+
+    def _learn(self, q, codes, cells, free, rewards, result_codes):
+        where = q.locate(codes, cells + 1)
+        previous = q.values[where]
+        # as in Q_Learner.learn, the max is over the moves that were free before
+        q_max = np.where(free, self._row_values(q, result_codes), -np.inf).max(1)
+        q.values[where] = previous + self.alpha*((rewards + self.gamma*q_max) - previous)
+
+    def play(self, games, learn=True):
+        """Play games to the end, returns the X wins, O wins and draws."""
+        boards = np.zeros((games, 9), dtype=int)
+        turn = self.rng.randint(2, size=games)
+        active = np.ones(games, dtype=bool)
+        last_code = np.zeros((2, games), dtype=int)
+        last_cell = np.full((2, games), -1)
+        last_free = np.zeros((2, games, 9), dtype=bool)
+        outcome = np.zeros(games, dtype=int)
+
+        while active.any():
+            for player in (0, 1):
+                movers = np.flatnonzero(active & (turn == player))
+                if not len(movers):
+                    continue
+                q = self.tables[player]
+                codes = encode_batch(boards[movers])
+                free = boards[movers] == 0
+                cells = self._choose(q, self.epsilon[player], codes, free)
+                boards[movers, cells] = player + 1
+                last_code[player, movers] = codes
+                last_cell[player, movers] = cells
+                last_free[player, movers] = free
+
+                won = wins(boards[movers], player + 1)
+                drawn = ~won & full(boards[movers])
+                outcome[movers[won]] = player + 1
+                other = 1 - player
+                if learn:
+                    result = encode_batch(boards[movers])
+                    ended = won | drawn
+                    self._learn(q, codes[ended], cells[ended], free[ended],
+                                np.where(won[ended], 1.0, 0.0), result[ended])
+                    waiting = last_cell[other, movers] >= 0
+                    self._learn(self.tables[other], last_code[other, movers[waiting]],
+                                last_cell[other, movers[waiting]],
+                                last_free[other, movers[waiting]],
+                                np.where(won[waiting], -1.0, 0.0), result[waiting])
+                active[movers[won | drawn]] = False
+                turn[movers] = other
+
+        return (int((outcome == 1).sum()), int((outcome == 2).sum()),
+                int((outcome == 0).sum()))
+
+    def train(self, games, batch=100):
+        results = np.zeros(3, dtype=int)
+        for first in range(0, games, batch):
+            results += self.play(min(batch, games - first))
+        return tuple(int(count) for count in results)
+
+
+# master tables in slot 0, one slot per job of a round after that
+_shared = None
+
+
+def _share(shared, shape):
+    global _shared
+    _shared = np.frombuffer(shared, dtype=float).reshape(shape)
+
+
+def _train_job(job):
+    slot, games, batch, symmetry, epsilon, alpha, gamma, seed = job
+    tables = []
+    for side in (0, 1):
+        q = QTable(symmetry=symmetry)
+        q.values = _shared[0, side].copy()
+        tables.append(q)
+    results = BatchSelfPlay(tables[0], tables[1], epsilon, alpha, gamma, seed).train(games, batch)
+    for side in (0, 1):
+        _shared[slot, side] = tables[side].values
+    return results
+
+
+def train_parallel(q_x, q_o, games, processes=None, rounds=10, batch=100, epsilon=0.2,
+                   alpha=0.3, gamma=0.9, seed=None, report=None):
+    """
+    Train two distinct tables of the same kind on games spread over a pool.
+
+    report(round, games_played, games_per_second, (x_wins, o_wins, draws))
+    is called after every round; the totals are returned.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    shape = (processes + 1, 2) + q_x.values.shape
+    shared = multiprocessing.RawArray('d', int(np.prod(shape)))
+    _share(shared, shape)
+    master = _shared
+    master[0, 0], master[0, 1] = q_x.values, q_o.values
+    rng = np.random.RandomState(seed)
+    pool = multiprocessing.Pool(processes, _share, (shared, shape))
+    totals = np.zeros(3, dtype=int)
+    played = 0
+    begin = time.time()
+    try:
+        for number in range(rounds):
+            share = (games - played) // (rounds - number)
+            jobs = [(slot + 1, (share + slot) // processes, batch, q_x.symmetry, epsilon,
+                     alpha, gamma, rng.randint(2**31)) for slot in range(processes)]
+            for results in pool.map(_train_job, jobs):
+                totals += results
+            master[0] = master[1:].mean(0)
+            played += share
+            if report != None:
+                report(number + 1, played, played/(time.time() - begin), tuple(totals))
+    finally:
+        pool.terminate()
+        pool.join()
+    q_x.values[:], q_o.values[:] = master[0, 0], master[0, 1]
+    return tuple(int(count) for count in totals)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""
+Post-processing of planned paths before they are sent to the arm.
+
+RRT paths have a vertex every EPSILON and run_plan stops the arm at each
+one, so the fewer waypoints the better:
+
+    shortcut         drop every vertex the path can skip with a clear edge
+    prune_collinear  drop vertices lying on the line through their neighbors
+    resample         evenly spaced waypoints, at most spacing apart
+
+All of them work on planar (x, y) points and keep both end points.
+"""
+from math import ceil, sqrt
+
+import numpy as np
+
+
+def shortcut(points, checker):
+    # greedy, from each kept vertex jump to the farthest one with a clear edge
+    points = [tuple(point) for point in points]
+    kept = [points[0]]
+    i = 0
+    while i < len(points) - 1:
+        later = points[i+1:]
+        free = checker.edges_free([points[i]]*len(later), later)
+        # the next vertex is always reachable, it was an edge of the plan
+        free[0] = True
+        i += int(np.flatnonzero(free)[-1]) + 1
+        kept.append(points[i])
+    return kept
+
+
+def prune_collinear(points, tolerance=1e-6):
+    points = [tuple(point) for point in points]
+    kept = points[:1]
+    for i in range(1, len(points) - 1):
+        (ax, ay), (bx, by), (cx, cy) = kept[-1], points[i], points[i+1]
+        length = sqrt((cx - ax)**2 + (cy - ay)**2)
+        # distance of b from the line a-c
+        if length > 0 and abs((cx - ax)*(by - ay) - (cy - ay)*(bx - ax))/length <= tolerance:
+            continue
+        kept.append(points[i])
+    if len(points) > 1:
+        kept.append(points[-1])
+    return kept
+
+
+def resample(points, spacing):
+    # every segment is split evenly, so corners and clearance are kept
+    points = [tuple(point) for point in points]
+    resampled = points[:1]
+    for (ax, ay), (bx, by) in zip(points[:-1], points[1:]):
+        steps = max(1, int(ceil(sqrt((bx - ax)**2 + (by - ay)**2)/spacing)))
+        for step in range(1, steps + 1):
+            t = step/float(steps)
+            resampled.append((ax + t*(bx - ax), ay + t*(by - ay)))
+    return resampled
+
+
+def smooth(points, checker, spacing=None):
+    if len(points) < 2:
+        return [tuple(point) for point in points]
+    points = prune_collinear(shortcut(points, checker))
+    if spacing != None:
+        points = resample(points, spacing)
+    return points
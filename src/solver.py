@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""
+Exact tic-tac-toe solver.
+
+Negamax with alpha-beta pruning over boards as lists of 0 (empty), 1 (X)
+and 2 (O). Scores are from the side to move: a win is worth one more
+than the number of cells left empty after it, so quicker wins and
+slower losses are preferred, and a draw is 0. Searched positions go in
+a transposition table keyed by the base-3 board code and the side to
+move, with a flag telling whether the stored score is exact or only a
+bound from a cut-off search.
+
+solve_all() walks every position reachable from the empty board, with
+either side moving first, and keeps the optimal moves of each, after
+which best_moves() is a dictionary lookup.
+"""
+from board import MARKS, POWERS, LINES
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+def wins(cells, mark):
+    for a, b, c in LINES:
+        if mark == cells[a] == cells[b] == cells[c]:
+            return True
+    return False
+
+
+def _key(cells, mark):
+    return int(sum(cell*power for cell, power in zip(cells, POWERS)))*3 + mark
+
+
+class Solver(object):
+
+    def __init__(self):
+        self.table = {}
+        self.moves = {}
+
+    def _cells(self, grid):
+        return [MARKS.get(cell, cell) for cell in grid]
+
+    def _negamax(self, cells, mark, alpha, beta):
+        key = _key(cells, mark)
+        entry = self.table.get(key)
+        if entry != None:
+            score, flag = entry
+            if flag == EXACT:
+                return score
+            if flag == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+        original_alpha = alpha
+        empty = cells.count(0)
+        best = -10
+        for cell in range(9):
+            if cells[cell] != 0:
+                continue
+            cells[cell] = mark
+            if wins(cells, mark):
+                score = empty
+            elif empty == 1:
+                score = 0
+            else:
+                score = -self._negamax(cells, 3 - mark, -beta, -alpha)
+            cells[cell] = 0
+            best = max(best, score)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        if best <= original_alpha:
+            flag = UPPER
+        elif best >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (best, flag)
+        return best
+
+    def scores(self, grid, mark):
+        """Exact score of every free move (1-9) for mark, 'X'/'O' or 1/2."""
+        cells, mark = self._cells(grid), MARKS.get(mark, mark)
+        empty = cells.count(0)
+        scores = {}
+        for cell in range(9):
+            if cells[cell] != 0:
+                continue
+            cells[cell] = mark
+            if wins(cells, mark):
+                scores[cell + 1] = empty
+            elif empty == 1:
+                scores[cell + 1] = 0
+            else:
+                scores[cell + 1] = -self._negamax(cells, 3 - mark, -10, 10)
+            cells[cell] = 0
+        return scores
+
+    def value(self, grid, mark):
+        return max(self.scores(grid, mark).values())
+
+    def best_moves(self, grid, mark):
+        cells, mark = self._cells(grid), MARKS.get(mark, mark)
+        key = _key(cells, mark)
+        if key not in self.moves:
+            scores = self.scores(cells, mark)
+            best = max(scores.values())
+            self.moves[key] = sorted(move for move, score in scores.items() if score == best)
+        return self.moves[key]
+
+    def solve_all(self):
+        stack = [([0]*9, 1), ([0]*9, 2)]
+        seen = set()
+        while stack:
+            cells, mark = stack.pop()
+            key = _key(cells, mark)
+            if key in seen:
+                continue
+            seen.add(key)
+            self.best_moves(cells, mark)
+            for cell in range(9):
+                if cells[cell] != 0:
+                    continue
+                child = list(cells)
+                child[cell] = mark
+                if not wins(child, mark) and 0 in child:
+                    stack.append((child, 3 - mark))
+        return len(self.moves)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""
+Nearest and radius-neighbor indexes for the RRT planners.
+
+Every index stores arbitrary items together with their (x, y) position and
+answers the two queries the planners make on every sample:
+
+    nearest(x, y)   -> item closest to (x, y)
+    near(x, y, r)   -> items strictly closer than r, in insertion order
+
+'brute' walks the whole list like Node.closest2 does and is kept to check
+the results of the faster 'grid' index.
+"""
+from math import sqrt, floor, ceil
+
+
+class BruteForceIndex(object):
+
+    def __init__(self, cell_size=None):
+        self.items = []
+        self.points = []
+
+    def __len__(self):
+        return len(self.items)
+
+    def insert(self, item, x, y):
+        self.items.append(item)
+        self.points.append((x, y))
+
+    def nearest(self, x, y):
+        best_item = None
+        best_distance = None
+        for item, (px, py) in zip(self.items, self.points):
+            distance = sqrt((x - px)**2 + (y - py)**2)
+            if best_distance is None or distance < best_distance:
+                best_distance = distance
+                best_item = item
+        return best_item
+
+    def near(self, x, y, r):
+        return [item for item, (px, py) in zip(self.items, self.points)
+                if sqrt((x - px)**2 + (y - py)**2) < r]
+
+
+class GridIndex(object):
+    """
+    Uniform grid over the plane, updated incrementally on every insert.
+
+    Cells are kept in a dict so nodes may land anywhere, including on the
+    edges of the WIDTH x LENGTH space. Nearest queries search rings of
+    cells outward from the query cell and stop as soon as no unvisited
+    ring can hold anything closer than the best match so far.
+    """
+
+    def __init__(self, cell_size=10):
+        self.cell_size = float(cell_size)
+        self.cells = {}
+        self.count = 0
+        self.bounds = None
+
+    def __len__(self):
+        return self.count
+
+    def _cell(self, x, y):
+        return int(floor(x / self.cell_size)), int(floor(y / self.cell_size))
+
+    def insert(self, item, x, y):
+        cx, cy = self._cell(x, y)
+        self.cells.setdefault((cx, cy), []).append((item, x, y, self.count))
+        self.count += 1
+        if self.bounds is None:
+            self.bounds = [cx, cy, cx, cy]
+        else:
+            self.bounds = [min(self.bounds[0], cx), min(self.bounds[1], cy),
+                           max(self.bounds[2], cx), max(self.bounds[3], cy)]
+
+    def _ring(self, cx, cy, k):
+        if k == 0:
+            yield cx, cy
+            return
+        for i in range(cx - k, cx + k + 1):
+            yield i, cy - k
+            yield i, cy + k
+        for j in range(cy - k + 1, cy + k):
+            yield cx - k, j
+            yield cx + k, j
+
+    def nearest(self, x, y):
+        if self.bounds is None:
+            return None
+        cx, cy = self._cell(x, y)
+        # farthest ring that can still contain an occupied cell
+        last = max(cx - self.bounds[0], self.bounds[2] - cx,
+                   cy - self.bounds[1], self.bounds[3] - cy)
+        best_item = None
+        best_distance = None
+        best_order = None
+        k = 0
+        while k <= last:
+            for cell in self._ring(cx, cy, k):
+                for item, px, py, order in self.cells.get(cell, ()):
+                    distance = sqrt((x - px)**2 + (y - py)**2)
+                    # ties go to the earliest insert, like min() over a list
+                    if (best_distance is None or distance < best_distance or
+                            (distance == best_distance and order < best_order)):
+                        best_distance = distance
+                        best_item = item
+                        best_order = order
+            # anything in ring k+1 or beyond is at least k cells away
+            if best_distance is not None and best_distance <= k * self.cell_size:
+                break
+            k += 1
+        return best_item
+
+    def near(self, x, y, r):
+        cx, cy = self._cell(x, y)
+        reach = int(ceil(r / self.cell_size))
+        found = []
+        for i in range(cx - reach, cx + reach + 1):
+            for j in range(cy - reach, cy + reach + 1):
+                for item, px, py, order in self.cells.get((i, j), ()):
+                    if sqrt((x - px)**2 + (y - py)**2) < r:
+                        found.append((order, item))
+        found.sort(key=lambda entry: entry[0])
+        return [item for order, item in found]
+
+
+INDEXES = {
+    'brute': BruteForceIndex,
+    'grid': GridIndex,
+}
+
+
+def make_index(kind, cell_size):
+    try:
+        return INDEXES[kind](cell_size)
+    except KeyError:
+        raise ValueError('unknown index {!r}, expected one of {}'.format(
+            kind, sorted(INDEXES)))
@@ -1,9 +1,18 @@
 import random
-from rtica import RRT
-from custom import run_plan
+from rtica import RRT, PRM, obstacles, start, goals, get_goal
+from roadmap import Roadmap
+from plancache import PlanCache
+from board import WINNING, FULL
+from qtable import QTable
+from selfplay import train_parallel
+from solver import Solver
+from prefetch import PlanPrefetcher
+from custom import run_plan, ArmSession
+from pipeline import Pipeline
 import argparse
 import struct
 import sys
+import os
 import copy
 
 import rospy
@@ -11,12 +20,25 @@ import rospkg
 
 
 class TTT:
-    def __init__(self, playerX, playerO):
+    def __init__(self, playerX, playerO, planner=RRT, prefetch=None, execute=run_plan,
+                 pipeline=None):
         self.grid = [' ']*9
+        # per player bitboards, the grid is kept for display and the learners
+        self.bits = {'X': 0, 'O': 0}
         self.playerX, self.playerO = playerX, playerO
+        self.planner = planner
+        self.prefetch = prefetch
+        self.execute = execute
+        self.pipeline = pipeline
         self.playerX_turn = random.choice([True, False])
 
     def play_game(self, plot = False):
+        if plot == True:
+            if self.pipeline != None:
+                # the last game's moves, the winning one too, are finished first
+                self.pipeline.wait()
+            # a new game starts on an empty board
+            del obstacles[:]
         self.playerX.start_game('X')
         self.playerO.start_game('O')
         while True: 
@@ -26,19 +48,33 @@ class TTT:
                 player, char, other_player = self.playerO, 'O', self.playerX
             if player.breed == "human":
                 self.display_board()
+                if plot == True and self.prefetch != None and other_player.breed != "human":
+                    # plan the learner's likely replies while the human thinks
+                    self.prefetch(other_player.top_moves(self.grid))
             space = player.move(self.grid)
-            if player.breed == "Qlearner" and plot == True:
-                path = RRT(space)
+            ticket = None
+            if player.breed != "human" and plot == True and self.pipeline != None:
+                # planned, solved and executed in the background, overlapping the game;
+                # the plan gets the board as it is now, the board is only changed here
+                placed = list(obstacles)
+                obstacles.append(get_goal(space))
+                ticket = self.pipeline.submit((space, placed))
+            elif player.breed != "human" and plot == True:
+                path = self.planner(space)
                 # first = (0.4,0.5)
                 path.reverse()
                 # path.insert(0,first)
-                run_plan(path)
+                self.execute(path)
                 print path
 
             if self.grid[space-1] != ' ': 
+                if ticket != None:
+                    # the cell is taken, the arm must not place a piece there
+                    ticket.cancel()
                 player.reward(-99, self.grid) 
                 break
             self.grid[space-1] = char
+            self.bits[char] |= 1 << (space-1)
             if self.player_wins(char):
                 player.reward(1, self.grid)
                 other_player.reward(-1, self.grid)
@@ -51,15 +87,10 @@ class TTT:
             self.playerX_turn = not self.playerX_turn
 
     def player_wins(self, char):
-        for a,b,c in [(0,1,2), (3,4,5), (6,7,8),
-                      (0,3,6), (1,4,7), (2,5,8),
-                      (0,4,8), (2,4,6)]:
-            if char == self.grid[a] == self.grid[b] == self.grid[c]:
-                return True
-        return False
+        return WINNING[self.bits[char]]
 
     def board_full(self):
-        return not any([space == ' ' for space in self.grid])
+        return self.bits['X'] | self.bits['O'] == FULL
 
     def display_board(self):
         row = " {} | {} | {}"
@@ -86,10 +117,11 @@ class Player(object):
     
 
 class Q_Learner(Player):
-    def __init__(self, epsilon=0.2, alpha=0.3, gamma=0.9):
+    def __init__(self, epsilon=0.2, alpha=0.3, gamma=0.9, symmetry=False):
         self.breed = "Qlearner"
         self.harm_humans = False
-        self.q = {} 
+        # with symmetry, rotated and mirrored boards are learned as one
+        self.q = QTable(symmetry=symmetry)
         self.epsilon = epsilon 
         self.alpha = alpha 
         self.gamma = gamma 
@@ -98,11 +130,6 @@ class Q_Learner(Player):
         self.previous_grid = (' ',)*9
         self.last_move = None
 
-    def Q_update(self, state, action):
-        if self.q.get((state, action)) is None:
-            self.q[(state, action)] = 1.0
-        return self.q.get((state, action))
-
     def move(self, grid):
         self.previous_grid = tuple(grid)
         actions = self.available_moves(grid)
@@ -111,7 +138,7 @@ class Q_Learner(Player):
             self.last_move = random.choice(actions)
             return self.last_move
 
-        qs = [self.Q_update(self.previous_grid, a) for a in actions]
+        qs = list(self.q.q_values(self.previous_grid, actions))
         maxQ = max(qs)
 
         if qs.count(maxQ) > 1:
@@ -124,25 +151,103 @@ class Q_Learner(Player):
         #print('my move was {}'.format(actions[i]))
         return actions[i]
 
+    def top_moves(self, grid, k=4):
+        actions = self.available_moves(grid)
+        qs = self.q.q_values(grid, actions)
+        return [actions[i] for i in sorted(range(len(actions)), key=lambda i: -qs[i])[:k]]
+
     def reward(self, value, grid):
         if self.last_move:
             self.learn(self.previous_grid, self.last_move, value, tuple(grid))
 
     def learn(self, state, action, reward, result_state):
-        prev = self.Q_update(state, action)
-        Qmax = max([self.Q_update(result_state, a) for a in self.available_moves(state)])
-        self.q[(state, action)] = prev + self.alpha * ((reward + self.gamma*Qmax) - prev)
+        prev = self.q.get(state, action)
+        Qmax = self.q.q_values(result_state, self.available_moves(state)).max()
+        self.q.set(state, action, prev + self.alpha * ((reward + self.gamma*Qmax) - prev))
+
+
+class Minimax(Player):
+    def __init__(self, precompute=False):
+        self.breed = "minimax"
+        self.solver = Solver()
+        if precompute:
+            # every reachable position, moves are then a table lookup
+            self.solver.solve_all()
+
+    def start_game(self, char):
+        self.char = char
+
+    def move(self, grid):
+        return random.choice(self.solver.best_moves(grid, self.char))
+
+    def top_moves(self, grid, k=4):
+        return self.solver.best_moves(grid, self.char)[:k]
+
+    def reward(self, value, grid):
+        pass
+
+
+player1 = Q_Learner(symmetry=True)
+player2 = Q_Learner(symmetry=True)
 
+def print_progress(number, games, games_per_second, results):
+    print("round {}: {} games, {:.0f} games/s, X/O/draw {}/{}/{}".format(
+        number, games, games_per_second, *results))
 
-player1 = Q_Learner()
-player2 = Q_Learner()
-for i in range(0,1000):
-    t = TTT(player1, player2)
-    t.play_game()
+# trained once with a fixed seed, later launches map the saved tables
+POLICY = [os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+          for name in ('player1.qtable', 'player2.qtable')]
+if all(os.path.exists(filename) for filename in POLICY):
+    player1.q, player2.q = [QTable.load(filename) for filename in POLICY]
+else:
+    # same games and updates as TTT(player1, player2).play_game(), batched on every core
+    train_parallel(player1.q, player2.q, 100000, epsilon=player1.epsilon, alpha=player1.alpha,
+                   gamma=player1.gamma, seed=0, report=print_progress)
+    player1.q.save(POLICY[0])
+    player2.q.save(POLICY[1])
 
 player1 = Player()
 player2.epsilon = 0
 
+# built on the first launch, moves are then answered by a graph search
+ROADMAP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'roadmap.npz')
+roadmap = Roadmap.load_or_build(ROADMAP, start, goals)
+PLANS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'plans.pickle')
+plans = PlanCache(filename=PLANS)
+# idle cores refine the plans for likely moves with anytime RRT*
+# paths are shortcut and resampled so the arm stops at most every SPACING units
+SPACING = 30
+prefetcher = PlanPrefetcher(plans, anytime=True, max_iterations=2000, smooth=True, spacing=SPACING)
+
+def fallback(tic, placed=None):
+    # off the main thread under the pipeline, so nothing is drawn
+    return PRM(tic, roadmap, smooth=True, spacing=SPACING, placed=placed, render=False)
+
+def planner(space):
+    return prefetcher.plan(space, fallback)
+
+def prefetch(tics):
+    prefetcher.prefetch(tics, obstacles)
+
+# ROS and both arms are set up once
+session = ArmSession()
+
+def plan_move(job):
+    space, placed = job
+    path = prefetcher.plan(space, fallback, placed)
+    path.reverse()
+    print path
+    return path
+
+def on_board(ticket):
+    # the pieces the move was planned around and the move itself are still on the board
+    space, placed = ticket.job
+    return obstacles[:len(placed) + 1] == placed + [get_goal(space)]
+
+# planning the next move and IK overlap the arm executing the last one
+pipeline = Pipeline(plan_move, session.solve, session.execute, valid=on_board)
+
 while True:
-    t = TTT(player1, player2)
+    t = TTT(player1, player2, planner=planner, prefetch=prefetch, execute=session.submit,
+            pipeline=pipeline)
     t.play_game(True)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Time-parameterized joint trajectories for continuous arm motion.
+
+Waypoints are joint dictionaries like the ones ik_request returns. The
+trajectory passes through all of them without stopping: each segment
+is a cubic Hermite spline, the velocity at an inner waypoint is the
+central difference of its neighbors and zero at both ends. Segment
+durations start from the slowest joint and are stretched until no
+joint exceeds max_velocity or max_acceleration anywhere on the way.
+
+execute() streams positions to anything with set_joint_positions(),
+such as a baxter_interface.Limb, at a fixed rate.
+"""
+import time
+
+import numpy as np
+
+# points per segment the limits are checked at
+CHECKS = 20
+
+
+class Trajectory(object):
+
+    def __init__(self, names, times, positions, velocities):
+        self.names = names
+        self.times = times
+        self.positions = positions
+        self.velocities = velocities
+
+    @property
+    def duration(self):
+        return float(self.times[-1])
+
+    def sample(self, t):
+        """Positions, velocities and accelerations as arrays at time t."""
+        i = int(np.clip(np.searchsorted(self.times, t, 'right') - 1, 0, len(self.times) - 2))
+        h = self.times[i+1] - self.times[i]
+        if h <= 0:
+            # a single waypoint, nothing to move
+            return self.positions[i+1], np.zeros(len(self.names)), np.zeros(len(self.names))
+        s = np.clip((t - self.times[i])/h, 0.0, 1.0)
+        p0, p1 = self.positions[i], self.positions[i+1]
+        m0, m1 = self.velocities[i]*h, self.velocities[i+1]*h
+        position = ((2*s**3 - 3*s**2 + 1)*p0 + (s**3 - 2*s**2 + s)*m0 +
+                    (-2*s**3 + 3*s**2)*p1 + (s**3 - s**2)*m1)
+        velocity = ((6*s**2 - 6*s)*p0 + (3*s**2 - 4*s + 1)*m0 +
+                    (-6*s**2 + 6*s)*p1 + (3*s**2 - 2*s)*m1)/h
+        acceleration = ((12*s - 6)*p0 + (6*s - 4)*m0 + (-12*s + 6)*p1 + (6*s - 2)*m1)/h**2
+        return position, velocity, acceleration
+
+    def joint_positions(self, t):
+        return dict(zip(self.names, self.sample(t)[0]))
+
+
+def _tangents(positions, times):
+    velocities = np.zeros_like(positions)
+    if len(positions) > 2:
+        velocities[1:-1] = ((positions[2:] - positions[:-2]) /
+                            (times[2:] - times[:-2])[:, None])
+    return velocities
+
+
+def time_parameterize(waypoints, max_velocity=1.0, max_acceleration=2.0, iterations=20):
+    names = sorted(waypoints[0])
+    positions = np.array([[waypoint[name] for name in names] for waypoint in waypoints], dtype=float)
+    # drop repeated waypoints, they would make zero-length segments
+    keep = np.r_[True, np.abs(np.diff(positions, axis=0)).max(1) > 1e-9]
+    positions = positions[keep]
+    if len(positions) == 1:
+        return Trajectory(names, np.array([0.0, 0.0]), positions.repeat(2, 0),
+                          np.zeros((2, len(names))))
+    delta = np.abs(np.diff(positions, axis=0)).max(1)
+    # a rest-to-rest cubic peaks at 1.5 delta/T in velocity and 6 delta/T^2 in acceleration
+    durations = np.maximum(1.5*delta/max_velocity, np.sqrt(6*delta/max_acceleration))
+    for _ in range(iterations):
+        times = np.r_[0.0, np.cumsum(durations)]
+        trajectory = Trajectory(names, times, positions, _tangents(positions, times))
+        stretch = np.ones(len(durations))
+        for i in range(len(durations)):
+            for s in np.linspace(0, 1, CHECKS):
+                position, velocity, acceleration = trajectory.sample(times[i] + s*durations[i])
+                stretch[i] = max(stretch[i], np.abs(velocity).max()/max_velocity,
+                                 np.sqrt(np.abs(acceleration).max()/max_acceleration))
+        if (stretch <= 1 + 1e-6).all():
+            break
+        durations = durations*stretch
+    return trajectory
+
+
+def execute(limb, trajectory, rate=100.0, now=time.time, sleep=time.sleep):
+    """Stream the trajectory to limb.set_joint_positions, one command per 1/rate s."""
+    begin = now()
+    tick = 0
+    while True:
+        t = tick/float(rate)
+        limb.set_joint_positions(trajectory.joint_positions(min(t, trajectory.duration)))
+        if t >= trajectory.duration:
+            break
+        # skip ticks rather than slow the motion down when running late
+        tick = max(tick + 1, int((now() - begin)*rate))
+        sleep(max(0.0, begin + tick/float(rate) - now()))
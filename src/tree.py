@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Array-backed RRT tree.
+
+Nodes are plain integer ids into growable array.array columns for x, y,
+parent and cost-to-come, plus first-child / next-sibling links used to
+push cost changes down after a rewire. Nothing is allocated per node, so
+plans with tens of thousands of samples stay cheap on memory and GC.
+
+tree.node(i) returns a TreeNode view with the attributes and methods of
+the old Node class (x, y, parent, path_to_start, cost_to_start, ...), so
+code that walks a finished path keeps working.
+"""
+from array import array
+from math import sqrt
+
+NONE = -1
+
+
+class Tree(object):
+
+    def __init__(self):
+        self.x = array('d')
+        self.y = array('d')
+        self.cost = array('d')
+        self.parent = array('l')
+        self.first_child = array('l')
+        self.next_sibling = array('l')
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, x, y, parent=NONE):
+        i = len(self.x)
+        self.x.append(x)
+        self.y.append(y)
+        self.parent.append(parent)
+        self.first_child.append(NONE)
+        self.next_sibling.append(NONE)
+        if parent == NONE:
+            self.cost.append(0.0)
+        else:
+            self.cost.append(self.cost[parent] + self.distance(i, parent))
+            self._link(i, parent)
+        return i
+
+    def distance(self, i, j):
+        return sqrt((self.x[i] - self.x[j])**2 + (self.y[i] - self.y[j])**2)
+
+    def distance_to_point(self, i, x, y):
+        return sqrt((self.x[i] - x)**2 + (self.y[i] - y)**2)
+
+    def _link(self, i, parent):
+        self.next_sibling[i] = self.first_child[parent]
+        self.first_child[parent] = i
+
+    def _unlink(self, i, parent):
+        child = self.first_child[parent]
+        if child == i:
+            self.first_child[parent] = self.next_sibling[i]
+        else:
+            while self.next_sibling[child] != i:
+                child = self.next_sibling[child]
+            self.next_sibling[child] = self.next_sibling[i]
+        self.next_sibling[i] = NONE
+
+    def children(self, i):
+        found = []
+        child = self.first_child[i]
+        while child != NONE:
+            found.append(child)
+            child = self.next_sibling[child]
+        return found
+
+    def set_parent(self, i, parent):
+        # rewire in place and push the new cost-to-come down the subtree
+        ancestor = parent
+        while ancestor != NONE:
+            if ancestor == i:
+                raise ValueError('cannot rewire node {} under its own descendant'.format(i))
+            ancestor = self.parent[ancestor]
+        if self.parent[i] != NONE:
+            self._unlink(i, self.parent[i])
+        self.parent[i] = parent
+        self._link(i, parent)
+        stack = [i]
+        while stack:
+            node = stack.pop()
+            self.cost[node] = self.cost[self.parent[node]] + self.distance(node, self.parent[node])
+            child = self.first_child[node]
+            while child != NONE:
+                stack.append(child)
+                child = self.next_sibling[child]
+
+    def path(self, i):
+        path = [i]
+        while self.parent[i] != NONE:
+            i = self.parent[i]
+            path.append(i)
+        return path
+
+    def path_cost(self, i):
+        # walks the parent chain; used to check the cached cost
+        return sum(self.distance(node, self.parent[node]) for node in self.path(i)[:-1])
+
+    def node(self, i):
+        return TreeNode(self, i)
+
+
+class TreeNode(object):
+    __slots__ = ('tree', 'index')
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    def __eq__(self, other):
+        return (isinstance(other, TreeNode) and other.tree is self.tree and
+                other.index == self.index)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __str__(self):
+        return '({}, {})'.format(self.x, self.y)
+
+    @property
+    def x(self):
+        return self.tree.x[self.index]
+
+    @property
+    def y(self):
+        return self.tree.y[self.index]
+
+    @property
+    def cost(self):
+        return self.tree.cost[self.index]
+
+    @property
+    def parent(self):
+        parent = self.tree.parent[self.index]
+        return None if parent == NONE else TreeNode(self.tree, parent)
+
+    @property
+    def children(self):
+        return [TreeNode(self.tree, child) for child in self.tree.children(self.index)]
+
+    def distance_to(self, node):
+        return sqrt((self.x - node.x)**2 + (self.y - node.y)**2)
+
+    def path_to_start(self):
+        return [TreeNode(self.tree, i) for i in self.tree.path(self.index)]
+
+    def cost_to_start(self):
+        return self.cost
+
+    def path_cost(self):
+        return self.tree.path_cost(self.index)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the package modules import each other by name from src/, like rosrun does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
@@ -0,0 +1,94 @@
+import threading
+
+import pytest
+
+from armsession import ArmSession
+
+
+class FakePickAndPlace(object):
+    """Records the calls custom.PickAndPlace would send to the robot."""
+
+    def __init__(self, unreachable=(), fail=False):
+        self.unreachable = unreachable
+        self.fail = fail
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def joint_path(self, poses):
+        self.calls.append(('joint_path', list(poses)))
+        if any(pose[:2] in self.unreachable for pose in poses):
+            return None
+        return ['joints for {}'.format(pose) for pose in poses]
+
+    def follow_joint_path(self, trajectory):
+        self.release.wait()
+        if self.fail:
+            raise RuntimeError('limb stopped')
+        self.calls.append(('follow', trajectory))
+
+    def _servo_to_pose(self, pose):
+        self.calls.append(('servo', pose))
+
+    def _approach(self, pose):
+        self.calls.append(('approach', pose))
+
+    def gripper_open(self):
+        self.calls.append(('open',))
+
+    def gripper_close(self):
+        self.calls.append(('close',))
+
+
+def pose(x, y, z):
+    return (x, y, z)
+
+
+def test_run_picks_follows_and_places():
+    arm = FakePickAndPlace()
+    session = ArmSession(arm, pose, hover_distance=0.1)
+    assert session.run([(0.5, 0.2), (0.6, 0.3)])
+    assert [call[0] for call in arm.calls] == [
+        'joint_path', 'servo', 'close', 'approach', 'follow', 'servo', 'open', 'approach']
+    assert arm.calls[0][1] == [(0.5, 0.2, pytest.approx(0.15)), (0.6, 0.3, pytest.approx(0.15))]
+    assert arm.calls[5] == ('servo', (0.6, 0.3, -0.1))
+    session.close()
+
+
+def test_unreachable_plan_does_not_move():
+    arm = FakePickAndPlace(unreachable=[(0.6, 0.3)])
+    logged = []
+    session = ArmSession(arm, pose, log=logged.append)
+    assert not session.run([(0.5, 0.2), (0.6, 0.3)])
+    assert [call[0] for call in arm.calls] == ['joint_path']
+    assert len(logged) == 1
+    session.close()
+
+
+def test_submitted_plans_run_in_order():
+    arm = FakePickAndPlace()
+    arm.release.clear()
+    session = ArmSession(arm, pose)
+    session.submit([(0.1, 0.1)])
+    session.submit([(0.2, 0.2)])
+    assert not any(call[0] == 'follow' for call in arm.calls)
+    arm.release.set()
+    session.wait()
+    assert [call[1] for call in arm.calls if call[0] == 'follow'] == [
+        ['joints for (0.1, 0.1, 0.2)'], ['joints for (0.2, 0.2, 0.2)']]
+    session.close()
+
+
+def test_wait_raises_worker_errors():
+    arm = FakePickAndPlace(fail=True)
+    session = ArmSession(arm, pose)
+    session.submit([(0.1, 0.1)])
+    with pytest.raises(RuntimeError):
+        session.wait()
+    # reported once, the worker keeps going
+    session.wait()
+    arm.unreachable = [(0.2, 0.2)]
+    session.submit([(0.2, 0.2)])
+    with pytest.raises(ValueError):
+        session.wait()
+    session.close()
@@ -0,0 +1,46 @@
+import json
+
+import benchmark
+import rtica
+
+
+def test_runs_are_reproducible():
+    first = benchmark.run(rtica, 4, 'middle', 0)
+    second = benchmark.run(rtica, 4, 'middle', 0)
+    for key in ('solved', 'iterations', 'nodes', 'cost'):
+        assert first[key] == second[key]
+    assert first['solved'] and first['memory'] > 0
+    assert rtica.obstacles == []
+
+
+def test_iteration_cap_gives_up_without_placing():
+    stats = {}
+    assert rtica.RRT(9, render=False, seed=0, max_iterations=3, stats=stats) is None
+    assert stats == {'iterations': 3, 'samples': stats['samples'], 'nodes': 4, 'cost': None}
+    assert stats['samples'] >= 3
+    assert rtica.obstacles == []
+
+
+def test_results_serialize_and_compare(capsys):
+    results = benchmark.benchmark(['RRT_star'], ['crowded'], [0])
+    assert [r['tic'] for r in results['RRT_star']] == [3, 5, 7, 8, 9]
+    table = benchmark.summary_table(json.loads(json.dumps(results)))
+    benchmark.compare(table, table)
+    assert 'RRT_star/uniform/crowded' in capsys.readouterr().out
+
+
+def test_iterations_reported_per_sampler():
+    results = benchmark.benchmark(['rtica'], ['empty'], [0], samplers=['uniform', 'goal'])
+    table = benchmark.summary_table(results)
+    assert sorted(table) == ['rtica/goal/empty', 'rtica/uniform/empty']
+    # pulling samples onto the goal reaches it in fewer iterations
+    assert table['rtica/goal/empty']['iterations'] < table['rtica/uniform/empty']['iterations']
+
+
+def test_rejected_samples_are_counted():
+    runs = benchmark.benchmark(['rtica', 'RRT_star'], ['crowded'], [0])
+    for run in runs['rtica'] + runs['RRT_star']:
+        assert run['samples'] >= run['iterations']
+    # samples landing on placed pieces are drawn but never become iterations
+    assert any(run['samples'] > run['iterations'] for run in runs['rtica'])
+    assert benchmark.summary_table(runs)['rtica/uniform/crowded']['samples'] > 0
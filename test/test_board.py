@@ -0,0 +1,15 @@
+from itertools import product
+
+from board import LINES, WINNING, FULL
+
+
+def test_winning_table_matches_lines():
+    for cells in product([0, 1], repeat=9):
+        bits = sum(1 << i for i, cell in enumerate(cells) if cell)
+        assert WINNING[bits] == any(all(cells[i] for i in line) for line in LINES)
+
+
+def test_full_board():
+    x = sum(1 << i for i in (0, 2, 3, 7, 8))
+    o = sum(1 << i for i in (1, 4, 5, 6))
+    assert x | o == FULL and not WINNING[x] and not WINNING[o]
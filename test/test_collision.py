@@ -0,0 +1,51 @@
+from random import Random
+
+import numpy as np
+
+from collision import CollisionChecker, BOARD_LINES
+
+
+def test_points_match_per_obstacle_loop():
+    rng = Random(2)
+    obstacles = [[rng.random()*100, rng.random()*100, 6] for _ in range(5)]
+    checker = CollisionChecker(obstacles, 19)
+    points = [(rng.random()*150, rng.random()*150) for _ in range(500)]
+    expected = [all(((x - ox)**2 + (y - oy)**2)**0.5 > 19 for ox, oy, r in obstacles)
+                for x, y in points]
+    assert list(checker.points_free(points)) == expected
+
+
+def test_edge_through_obstacle_with_free_endpoints():
+    checker = CollisionChecker([[50, 50, 6]], 19)
+    assert checker.points_free([(0, 50), (100, 50)]).all()
+    free = checker.edges_free([(0, 50), (0, 0), (0, 80)], [(100, 50), (100, 0), (100, 80)])
+    assert list(free) == [False, True, True]
+
+
+def test_edges_against_samples_along_the_edge():
+    rng = Random(3)
+    checker = CollisionChecker([[49.5, 49.5, 6], [82.5, 16.5, 6]], 19)
+    starts = np.array([(rng.random()*150, rng.random()*150) for _ in range(300)])
+    ends = np.array([(rng.random()*150, rng.random()*150) for _ in range(300)])
+    free = checker.edges_free(starts, ends)
+    t = np.linspace(0, 1, 2001)
+    for a, b, ok in zip(starts, ends, free):
+        samples = a + t[:, None]*(b - a)
+        # an edge with a colliding sample on it can never pass as free
+        if not checker.points_free(samples).all():
+            assert not ok
+
+
+def test_board_lines_as_walls():
+    checker = CollisionChecker([], 19, BOARD_LINES, 1.5)
+    assert not checker.point_free(33, 50)
+    assert checker.point_free(16.5, 16.5)
+    free = checker.edges_free([(16.5, 16.5), (16.5, 16.5), (16.5, 120)],
+                              [(49.5, 16.5), (16.5, 30), (120, 120)])
+    assert list(free) == [False, True, True]
+
+
+def test_no_obstacles_is_all_free():
+    checker = CollisionChecker([], 19)
+    assert checker.points_free([(1, 1), (2, 2)]).all()
+    assert checker.edges_free([(1, 1)], [(2, 2)]).all()
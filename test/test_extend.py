@@ -0,0 +1,54 @@
+from random import Random
+
+import numpy as np
+
+import rtica
+from collision import CollisionChecker
+from extend import extend, extend_batch
+from spatial import make_index
+from tree import Tree
+
+
+def grow(points, batch, count=300):
+    tree = Tree()
+    nodes = make_index('brute', 15)
+    nodes.insert(tree.add(150, 150), 150, 150)
+    checker = CollisionChecker([[49.5, 49.5, 6], [82.5, 82.5, 6]], 19)
+    queue = list(points)
+    if batch:
+        def sample_batch(k):
+            drawn, queue[:k] = queue[:k], []
+            return drawn
+        candidates = extend_batch(tree, nodes, checker, sample_batch, 10, batch)
+    else:
+        candidates = extend(tree, nodes, checker, lambda: queue.pop(0), 10)
+    for _ in range(count):
+        x, y, closest, drawn = next(candidates)
+        nodes.insert(tree.add(x, y, closest), x, y)
+    return tree
+
+
+def test_batches_grow_the_same_tree_as_single_samples():
+    rng = Random(0)
+    points = [(rng.random()*150, rng.random()*150) for _ in range(5000)]
+    single = grow(points, None)
+    batched = grow(points, 32)
+    assert list(batched.parent) == list(single.parent)
+    assert np.allclose(batched.x, single.x) and np.allclose(batched.y, single.y)
+
+
+def test_batch_mode_is_reproducible_under_a_seed(monkeypatch):
+    paths = []
+    for _ in range(2):
+        monkeypatch.setattr(rtica, 'obstacles', [[49.5, 49.5, 6]])
+        paths.append(rtica.RRT(3, render=False, batch=16, seed=11))
+    assert paths[0] == paths[1]
+    monkeypatch.setattr(rtica, 'obstacles', [[49.5, 49.5, 6]])
+    assert rtica.RRT(3, render=False, batch=16, seed=12) != paths[0]
+
+
+def test_seed_makes_single_sample_runs_reproducible(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    first = rtica.RRT(9, render=False, seed=3)
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    assert rtica.RRT(9, render=False, seed=3) == first
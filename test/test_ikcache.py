@@ -0,0 +1,109 @@
+from collections import namedtuple
+
+from ikcache import IKCache, solve_path
+
+Point = namedtuple('Point', 'x y z')
+Quaternion = namedtuple('Quaternion', 'x y z w')
+Pose = namedtuple('Pose', 'position orientation')
+
+OVERHEAD = Quaternion(-0.0249590815779, 0.999649402929, 0.00737916180073, 0.00486450832011)
+
+
+class MockIKService(object):
+    # stands in for the SolvePositionIK service, one joint per coordinate
+
+    def __init__(self, reachable=lambda pose: True):
+        self.calls = 0
+        self.reachable = reachable
+
+    def __call__(self, pose):
+        self.calls += 1
+        if not self.reachable(pose):
+            return False
+        return {'left_s0': pose.position.x, 'left_s1': pose.position.y, 'left_e0': pose.position.z}
+
+
+def test_repeated_poses_skip_the_service():
+    cache = IKCache()
+    service = MockIKService()
+    cells = [Pose(Point(0.4 + 0.1*i, 0.5, 0.05), OVERHEAD) for i in range(3)]
+    for _ in range(5):
+        for pose in cells:
+            assert cache.solve('left', pose, service)['left_s0'] == pose.position.x
+    assert service.calls == 3 and (cache.hits, cache.misses) == (12, 3)
+    # a pose within the resolution is the same entry, another limb is not
+    assert cache.get('left', Pose(Point(0.4002, 0.5, 0.05), OVERHEAD)) != None
+    assert cache.get('right', cells[0]) == None
+
+
+def test_failures_are_not_cached():
+    cache = IKCache()
+    service = MockIKService(reachable=lambda pose: pose.position.z > 0)
+    down = Pose(Point(0.4, 0.5, -0.1), OVERHEAD)
+    assert cache.solve('left', down, service) is False
+    assert cache.solve('left', down, service) is False
+    assert service.calls == 2 and len(cache) == 0
+
+
+def test_lru_and_persistence(tmpdir):
+    filename = str(tmpdir.join('ik.pickle'))
+    cache = IKCache(capacity=2, filename=filename)
+    service = MockIKService()
+    poses = [Pose(Point(0.1*i, 0.0, 0.05), OVERHEAD) for i in range(3)]
+    for pose in poses:
+        cache.solve('left', pose, service)
+    # inserts stay in memory until flushed
+    assert IKCache(capacity=2, filename=filename).get('left', poses[2]) == None
+    cache.flush()
+    reloaded = IKCache(capacity=2, filename=filename)
+    assert reloaded.get('left', poses[0]) == None
+    assert reloaded.get('left', poses[2]) == service(poses[2])
+
+
+class MockBatchService(MockIKService):
+
+    def __init__(self, reachable=lambda pose: True, batch_fails=()):
+        MockIKService.__init__(self, reachable)
+        self.batches = []
+        self.singles = []
+        self.batch_fails = batch_fails
+
+    def batch(self, poses, seeds):
+        self.batches.append((list(poses), list(seeds)))
+        return [False if pose.position.x in self.batch_fails else MockIKService.__call__(self, pose)
+                for pose in poses]
+
+    def one(self, pose, seed):
+        self.singles.append((pose, seed))
+        return MockIKService.__call__(self, pose)
+
+
+def test_solve_path_is_one_request():
+    service = MockBatchService()
+    poses = [Pose(Point(0.1*i, 0.5, 0.2), OVERHEAD) for i in range(5)]
+    start = {'left_s0': 0.0}
+    joints = solve_path('left', poses, service.batch, service.one, start)
+    assert [j['left_s0'] for j in joints] == [pose.position.x for pose in poses]
+    assert len(service.batches) == 1 and not service.singles
+
+
+def test_solve_path_seeds_and_cache():
+    cache = IKCache()
+    service = MockBatchService(batch_fails=(0.2,))
+    poses = [Pose(Point(0.1*i, 0.5, 0.2), OVERHEAD) for i in range(4)]
+    cache.put('left', poses[0], {'left_s0': 0.0})
+    joints = solve_path('left', poses, service.batch, service.one, None, cache)
+    # the cached first waypoint seeds the next, failed ones retry from the previous solution
+    assert service.batches[0][0] == poses[1:]
+    assert service.batches[0][1] == [{'left_s0': 0.0}, {'left_s0': 0.0}, {'left_s0': 0.0}]
+    assert service.singles == [(poses[2], joints[1])]
+    assert len(cache) == 4
+    again = MockBatchService()
+    assert solve_path('left', poses, again.batch, again.one, None, cache) == joints
+    assert again.calls == 0
+
+
+def test_solve_path_unreachable():
+    service = MockBatchService(reachable=lambda pose: pose.position.x < 0.25)
+    poses = [Pose(Point(0.1*i, 0.5, 0.2), OVERHEAD) for i in range(4)]
+    assert solve_path('left', poses, service.batch, service.one) is None
@@ -0,0 +1,33 @@
+from lrucache import LRUCache
+
+
+def test_lookup_refreshes_and_counts():
+    cache = LRUCache(2)
+    cache.store('a', 1)
+    cache.store('b', 2)
+    assert cache.lookup('a') == 1
+    cache.store('c', 3)
+    assert 'b' not in cache and 'a' in cache and 'c' in cache
+    assert cache.lookup('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_saves_in_batches(tmpdir):
+    filename = str(tmpdir.join('store.pickle'))
+    cache = LRUCache(8, filename, save_every=2)
+    cache.store('a', 1)
+    assert len(LRUCache(8, filename)) == 0
+    cache.store('b', 2)
+    assert len(LRUCache(8, filename)) == 2
+    cache.store('c', 3)
+    cache.flush()
+    assert LRUCache(8, filename).lookup('c') == 3
+
+
+def test_never_saves_without_flush(tmpdir):
+    filename = str(tmpdir.join('store.pickle'))
+    cache = LRUCache(8, filename, save_every=None)
+    cache.store('a', 1)
+    assert not tmpdir.join('store.pickle').check()
+    cache.flush()
+    assert LRUCache(8, filename).lookup('a') == 1
@@ -0,0 +1,93 @@
+import threading
+import time
+
+from pipeline import Pipeline, DONE, CANCELLED, FAILED
+
+
+class Arm(object):
+    # records which stage handled what and when
+
+    def __init__(self, move_time=0.05):
+        self.move_time = move_time
+        self.events = []
+        self.lock = threading.Lock()
+
+    def log(self, *event):
+        with self.lock:
+            self.events.append(event + (time.time(),))
+
+    def plan(self, space):
+        self.log('plan', space)
+        return None if space == 0 else [(space, 0.0), (space, 1.0)]
+
+    def solve(self, path):
+        self.log('solve', path[0][0])
+        return [{'left_s0': x} for x, y in path]
+
+    def execute(self, path, trajectory):
+        self.log('execute start', path[0][0])
+        time.sleep(self.move_time)
+        self.log('execute end', path[0][0])
+
+
+def test_moves_run_in_order_and_overlap():
+    arm = Arm()
+    pipeline = Pipeline(arm.plan, arm.solve, arm.execute)
+    tickets = [pipeline.submit(space) for space in (1, 2, 3)]
+    pipeline.wait()
+    pipeline.close()
+    assert [ticket.state for ticket in tickets] == [DONE]*3
+    assert tickets[1].trajectory == [{'left_s0': 2}, {'left_s0': 2}]
+    executed = [event[1] for event in arm.events if event[0] == 'execute start']
+    assert executed == [1, 2, 3]
+    # the next move was planned and solved while the first one was executing
+    times = dict((event[:2], event[2]) for event in arm.events)
+    assert times[('solve', 2)] < times[('execute end', 1)]
+
+
+def test_cancel_and_invalid_plans():
+    arm = Arm(move_time=0.1)
+    dropped = set([3])
+    pipeline = Pipeline(arm.plan, arm.solve, arm.execute,
+                        valid=lambda ticket: ticket.job not in dropped)
+    first = pipeline.submit(1)
+    time.sleep(0.05)
+    second = pipeline.submit(2)
+    second.cancel()
+    third = pipeline.submit(3)
+    failed = pipeline.submit(0)
+    pipeline.wait()
+    pipeline.close()
+    assert first.state == DONE
+    assert second.state == CANCELLED and third.state == CANCELLED
+    assert failed.state == FAILED and isinstance(failed.error, ValueError)
+    assert [event[1] for event in arm.events if event[0] == 'execute start'] == [1]
+
+
+def test_cancel_all_keeps_the_running_move():
+    arm = Arm(move_time=0.1)
+    pipeline = Pipeline(arm.plan, arm.solve, arm.execute)
+    tickets = [pipeline.submit(space) for space in (1, 2, 3)]
+    time.sleep(0.05)
+    pipeline.cancel_all()
+    pipeline.wait()
+    pipeline.close()
+    assert [ticket.state for ticket in tickets] == [DONE, CANCELLED, CANCELLED]
+
+
+def test_cancel_loses_to_a_started_move():
+    started, release = threading.Event(), threading.Event()
+
+    def execute(path, trajectory):
+        started.set()
+        release.wait()
+
+    arm = Arm()
+    pipeline = Pipeline(arm.plan, arm.solve, execute)
+    ticket = pipeline.submit(1)
+    started.wait()
+    assert not ticket.cancel()
+    release.set()
+    pipeline.wait()
+    pipeline.close()
+    assert ticket.state == DONE
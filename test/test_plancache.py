@@ -0,0 +1,64 @@
+from random import Random
+
+import rtica
+from plancache import PlanCache
+
+
+def test_key_ignores_placement_order():
+    assert PlanCache.key(2, [[16.5, 82.5, 6], [49.5, 49.5, 6]]) == \
+        PlanCache.key(2, [[49.5, 49.5, 6], [16.5, 82.5, 6]])
+    assert PlanCache.key(2, []) != PlanCache.key(3, [])
+
+
+def test_lru_eviction():
+    cache = PlanCache(capacity=2)
+    cache.put(1, [], [[0.1, 0.2]])
+    cache.put(2, [], [[0.3, 0.4]])
+    assert cache.get(1, []) == [[0.1, 0.2]]
+    cache.put(3, [], [[0.5, 0.6]])
+    assert cache.get(2, []) is None
+    assert cache.get(1, []) is not None and cache.get(3, []) is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_persists_to_disk(tmpdir):
+    filename = str(tmpdir.join('plans.pickle'))
+    PlanCache(filename=filename).put(4, [[49.5, 49.5, 6]], [[0.1, 0.2], [0.3, 0.4]])
+    assert PlanCache(filename=filename).get(4, [[49.5, 49.5, 6]]) == [[0.1, 0.2], [0.3, 0.4]]
+
+
+def test_cached_plan_hits_and_checks(monkeypatch):
+    monkeypatch.setattr(rtica, 'random', Random(7).random)
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    calls = []
+
+    def planner(tic, placed=None):
+        calls.append(tic)
+        return rtica.RRT(tic, render=False, placed=placed)
+
+    cache = PlanCache()
+    first = rtica.cached_plan(6, cache, planner)
+    assert rtica.obstacles == [rtica.get_goal(6)]
+
+    del rtica.obstacles[:]
+    assert rtica.cached_plan(6, cache, planner) == first
+    assert calls == [6]
+    assert rtica.obstacles == [rtica.get_goal(6)]
+
+    # a stored plan that runs through a placed piece is replanned
+    cache.put(6, [[49.5, 49.5, 6]], [rtica.robot_coordinates(0, 49.5),
+                                     rtica.robot_coordinates(100, 49.5)])
+    rtica.obstacles[:] = [[49.5, 49.5, 6]]
+    rtica.cached_plan(6, cache, planner)
+    assert calls == [6, 6]
+
+
+def test_cached_plan_against_placed_leaves_board(monkeypatch):
+    monkeypatch.setattr(rtica, 'random', Random(3).random)
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    placed = [rtica.get_goal(5)]
+    cache = PlanCache()
+    first = rtica.cached_plan(1, cache, placed=placed)
+    assert first and cache.get(1, placed) == first
+    assert rtica.cached_plan(1, cache, placed=placed) == first
+    assert rtica.obstacles == [] and placed == [rtica.get_goal(5)]
@@ -0,0 +1,34 @@
+from random import Random
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+import rtica
+from plantrace import PlanTrace
+
+
+def test_headless_run_opens_no_figure(monkeypatch):
+    monkeypatch.setattr(rtica, 'random', Random(1).random)
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    plt.close('all')
+    path = rtica.RRT(6, render=False)
+    assert path
+    assert plt.get_fignums() == []
+
+
+def test_trace_replays_to_file(monkeypatch, tmpdir):
+    monkeypatch.setattr(rtica, 'random', Random(1).random)
+    monkeypatch.setattr(rtica, 'obstacles', [[82.5, 82.5, 6]])
+    trace = PlanTrace()
+    path = rtica.RRT(6, render=False, trace=trace)
+    assert path
+    # the goal is appended to the live obstacles, not to the recorded ones
+    assert trace.obstacles == [[82.5, 82.5, 6]]
+    assert trace.frames() > 0
+
+    filename = str(tmpdir.join('tree.png'))
+    figure = trace.replay(rtica.setup_space, filename)
+    assert len(figure.axes[0].lines) == sum(1 for e in trace.events if e[0] == 'plot')
+    assert tmpdir.join('tree.png').size() > 0
+    plt.close('all')
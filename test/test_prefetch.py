@@ -0,0 +1,40 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import rtica
+from plancache import PlanCache
+from prefetch import PlanPrefetcher
+
+
+def test_plan_many_fills_cache(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    cache = PlanCache()
+    prefetcher = PlanPrefetcher(cache, processes=2, seed=0, max_iterations=20000)
+    try:
+        plans = prefetcher.plan_many([2, 5, 9], [rtica.get_goal(1)])
+    finally:
+        prefetcher.close()
+    assert sorted(plans) == [2, 5, 9]
+    for tic in plans:
+        assert plans[tic]
+        assert cache.get(tic, [rtica.get_goal(1)]) == [list(point) for point in plans[tic]]
+    # the workers' obstacles never leak into this process
+    assert rtica.obstacles == []
+
+
+def test_prefetched_plan_is_used(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    cache = PlanCache()
+    prefetcher = PlanPrefetcher(cache, processes=2, seed=1, max_iterations=20000)
+    try:
+        prefetcher.prefetch([3, 7], [])
+        prefetcher.prefetch([3], [])
+        assert len(prefetcher.pending) == 2
+
+        def fail(tic):
+            raise AssertionError('planned in the foreground')
+        path = prefetcher.plan(7, fail)
+    finally:
+        prefetcher.close()
+    assert path and cache.hits == 1
+    assert rtica.obstacles == [rtica.get_goal(7)]
@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+
+from board import STATES, SYMMETRIES, MARKS, encode, decode, encode_batch, canonical
+from qtable import QTable
+
+
+def test_encode_round_trip():
+    grid = ['X', ' ', 'O', ' ', 'X', ' ', ' ', 'O', 'X']
+    assert decode(encode(grid)) == grid
+    assert encode([' ']*9) == 0 and encode(['O']*9) == STATES - 1
+    assert encode(tuple(grid)) == encode(grid)
+
+
+def test_encode_is_unique():
+    codes = set(encode(decode(code)) for code in range(STATES))
+    assert codes == set(range(STATES))
+
+
+def test_encode_batch_matches_encode():
+    grids = [decode(code) for code in (0, 1, 4242, STATES - 1)]
+    boards = np.array([[MARKS[char] for char in grid] for grid in grids])
+    assert list(encode_batch(boards)) == [encode(grid) for grid in grids]
+
+
+def test_reads_do_not_insert():
+    q = QTable()
+    grid = ('X', ' ', ' ', ' ', 'O', ' ', ' ', ' ', ' ')
+    assert q.get(grid, 3) == 1.0
+    assert list(q.q_values(grid, [2, 3, 4])) == [1.0, 1.0, 1.0]
+    assert len(q) == 0
+    q.set(grid, 3, 0.25)
+    assert q.get(list(grid), 3) == 0.25 and len(q) == 1
+    assert list(q.q_values(grid, [3, 4])) == [0.25, 1.0]
+
+
+def test_symmetric_boards_share_values():
+    q = QTable(symmetry=True)
+    assert q.values.shape == (2862, 9)
+    grid = ['X', 'O', ' ', ' ', ' ', ' ', ' ', ' ', ' ']
+    q.set(grid, 9, 0.5)
+    # the same position rotated a quarter turn and mirrored
+    for perm in SYMMETRIES:
+        image = [grid[cell] for cell in perm]
+        moved = list(perm).index(8) + 1
+        assert q.get(image, moved) == 0.5
+        assert q.get(image, moved % 9 + 1) == 1.0
+    assert len(q) == 1
+
+
+def test_canonical_is_invariant():
+    grid = decode(12345)
+    codes = set(canonical([grid[cell] for cell in perm]) for perm in SYMMETRIES)
+    assert codes == set([canonical(grid)])
+    assert canonical(grid) == min(encode([grid[cell] for cell in perm]) for perm in SYMMETRIES)
+
+
+def test_save_and_map(tmpdir):
+    filename = str(tmpdir.join('policy.qtable'))
+    q = QTable(symmetry=True)
+    q.set(['X'] + [' ']*8, 5, 0.75)
+    q.save(filename)
+    loaded = QTable.load(filename)
+    assert loaded.symmetry and isinstance(loaded.values, np.memmap)
+    assert (loaded.values == q.values).all()
+    # learning after loading stays in memory
+    loaded.set(['X'] + [' ']*8, 5, 0.5)
+    assert QTable.load(filename).get(['X'] + [' ']*8, 5) == 0.75
+
+
+def test_load_rejects_bad_files(tmpdir):
+    filename = str(tmpdir.join('policy.qtable'))
+    QTable().save(filename)
+    with open(filename, 'r+b') as table:
+        table.seek(-1, 2)
+        table.write(b'\x01')
+    with pytest.raises(ValueError):
+        QTable.load(filename)
+    with open(filename, 'r+b') as table:
+        table.write(b'JUNK')
+    with pytest.raises(ValueError):
+        QTable.load(filename)
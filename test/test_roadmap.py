@@ -0,0 +1,46 @@
+import numpy as np
+
+import rtica
+from collision import CollisionChecker
+from roadmap import Roadmap
+
+
+def build():
+    return Roadmap.build(rtica.start, rtica.goals, samples=300, seed=1)
+
+
+def test_save_and_load_round_trip(tmpdir):
+    roadmap = build()
+    filename = str(tmpdir.join('roadmap.npz'))
+    roadmap.save(filename)
+    loaded = Roadmap.load(filename)
+    assert np.array_equal(loaded.points, roadmap.points)
+    assert np.array_equal(loaded.edges, roadmap.edges)
+    assert Roadmap.load_or_build(filename, rtica.start, rtica.goals).edges.shape == roadmap.edges.shape
+
+
+def test_load_or_build_creates_the_file(tmpdir):
+    filename = str(tmpdir.join('roadmap.npz'))
+    Roadmap.load_or_build(filename, rtica.start, rtica.goals, samples=50)
+    assert tmpdir.join('roadmap.npz').check()
+
+
+def test_path_avoids_placed_pieces():
+    roadmap = build()
+    placed = [list(rtica.get_goal(5)), list(rtica.get_goal(6))]
+    clear = roadmap.path(8, [], 19)
+    blocked = roadmap.path(8, placed, 19)
+    assert clear[0] == tuple(rtica.start) and clear[-1] == rtica.goals[7]
+    assert blocked[-1] == rtica.goals[7]
+    checker = CollisionChecker(placed, 19)
+    assert checker.edges_free(blocked[:-1], blocked[1:]).all()
+    # blocked edges are forgotten once the obstacles change again
+    assert roadmap.path(8, [], 19) == clear
+
+
+def test_prm_matches_rrt_output(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    path = rtica.PRM(3, build())
+    assert path[0] == rtica.robot_coordinates(*rtica.goals[2])
+    assert path[-1] == rtica.robot_coordinates(*rtica.start)
+    assert rtica.obstacles == [rtica.get_goal(3)]
@@ -0,0 +1,100 @@
+from random import Random
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pytest
+
+import rtica
+from collision import CollisionChecker
+from tree import Tree
+
+
+def assert_costs_cached(nodes):
+    for node in nodes:
+        assert node.cost_to_start() == pytest.approx(node.path_cost())
+
+
+def recording_tree(monkeypatch):
+    trees = []
+
+    def make_tree():
+        tree = Tree()
+        trees.append(tree)
+        return tree
+
+    monkeypatch.setattr(rtica, 'Tree', make_tree)
+    return trees
+
+
+def test_rrt_tree_costs_match_recomputed(monkeypatch):
+    trees = recording_tree(monkeypatch)
+    monkeypatch.setattr(rtica, 'random', Random(4).random)
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    monkeypatch.setattr(plt, 'pause', lambda interval: None)
+    try:
+        path = rtica.RRT(8)
+    finally:
+        plt.close('all')
+
+    assert path
+    tree = trees[-1]
+    assert len(tree) > 1
+    assert_costs_cached([tree.node(i) for i in range(len(tree))])
+
+
+def test_rrt_tree_edges_clear_obstacles(monkeypatch):
+    trees = recording_tree(monkeypatch)
+    placed = [[49.5, 49.5, 6], [82.5, 49.5, 6]]
+    monkeypatch.setattr(rtica, 'random', Random(5).random)
+    monkeypatch.setattr(rtica, 'obstacles', [list(obstacle) for obstacle in placed])
+    assert rtica.RRT(7, render=False)
+
+    tree = trees[-1]
+    edges = [tree.node(i) for i in range(1, len(tree))]
+    checker = CollisionChecker(placed, rtica.radius+1)
+    assert checker.edges_free([(node.x, node.y) for node in edges],
+                              [(node.parent.x, node.parent.y) for node in edges]).all()
+
+
+def test_grid_and_brute_plan_the_same_tree(monkeypatch):
+    paths = []
+    for kind in ['brute', 'grid']:
+        monkeypatch.setattr(rtica, 'random', Random(6).random)
+        monkeypatch.setattr(rtica, 'obstacles', [[49.5, 49.5, 6]])
+        paths.append(rtica.RRT(1, index=kind, render=False))
+    assert paths[0] == paths[1]
+
+
+def test_anytime_improves_until_the_budget(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    first = {}
+    rtica.RRT(7, render=False, seed=1, stats=first)
+    del rtica.obstacles[:]
+    stats = {}
+    path = rtica.RRT(7, render=False, seed=1, anytime=True, max_iterations=1500,
+                     sampler='informed', stats=stats)
+    assert path and stats['iterations'] == 1500
+    costs = [cost for elapsed, iteration, cost in stats['curve']]
+    assert costs == sorted(costs, reverse=True) and len(set(costs)) == len(costs)
+    assert stats['cost'] == costs[-1] < first['cost']
+    assert rtica.obstacles == [rtica.get_goal(7)]
+
+
+def test_anytime_time_budget(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    stats = {}
+    begin = rtica.clock()
+    assert rtica.RRT(4, render=False, seed=2, anytime=True, time_budget=0.05, stats=stats)
+    # every improvement was found within the budget, the run itself stops after it
+    assert all(elapsed < 0.05 for elapsed, iteration, cost in stats['curve'])
+    assert stats['cost'] <= stats['curve'][-1][2]
+    assert rtica.clock() - begin >= 0.05
+
+
+def test_anytime_needs_a_budget(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [])
+    with pytest.raises(ValueError):
+        rtica.RRT(4, render=False, anytime=True)
+    assert rtica.RRT(4, render=False, seed=2, anytime=True, max_iterations=2) is None
+    assert rtica.obstacles == []
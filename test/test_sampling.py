@@ -0,0 +1,59 @@
+from math import sqrt
+from random import Random
+
+import numpy as np
+import pytest
+
+from sampling import make_sampler, UniformSampler
+
+START = (150, 150)
+GOAL = (49.5, 49.5)
+BOX = (0, 0, 150, 150)
+
+
+def test_uniform_stays_in_the_box():
+    sampler = make_sampler('uniform', (10, 20, 110, 60), START, GOAL)
+    rand = Random(0).random
+    points = np.array([sampler.sample(rand) for _ in range(1000)])
+    batch = sampler.sample_batch(np.random.RandomState(0), 1000)
+    for p in (points, batch):
+        assert p[:, 0].min() >= 10 and p[:, 0].max() <= 110
+        assert p[:, 1].min() >= 20 and p[:, 1].max() <= 60
+
+
+def test_uniform_matches_the_plain_draws():
+    rand = Random(1).random
+    expected = Random(1).random
+    sampler = UniformSampler(BOX)
+    for _ in range(10):
+        assert sampler.sample(rand) == (expected()*150, expected()*150)
+
+
+def test_goal_bias_rate():
+    sampler = make_sampler('goal', BOX, START, GOAL, goal_bias=0.2)
+    rand = Random(2).random
+    hits = sum(sampler.sample(rand) == GOAL for _ in range(5000))
+    batch = sampler.sample_batch(np.random.RandomState(2), 5000)
+    assert 0.17 < hits/5000.0 < 0.23
+    assert 0.17 < (batch == GOAL).all(1).mean() < 0.23
+
+
+def test_informed_samples_lie_in_the_ellipse():
+    sampler = make_sampler('informed', BOX, START, GOAL)
+    c_min = sqrt((START[0] - GOAL[0])**2 + (START[1] - GOAL[1])**2)
+    sampler.update(c_min*1.2)
+    sampler.update(c_min*1.5)
+    assert sampler.c_best == pytest.approx(c_min*1.2)
+
+    rand = Random(3).random
+    points = np.vstack([[sampler.sample(rand) for _ in range(500)],
+                        sampler.sample_batch(np.random.RandomState(3), 500)])
+    assert len(points) == 1000
+    focal = (np.hypot(points[:, 0] - START[0], points[:, 1] - START[1]) +
+             np.hypot(points[:, 0] - GOAL[0], points[:, 1] - GOAL[1]))
+    assert (focal <= sampler.c_best + 1e-9).all()
+
+
+def test_unknown_sampler():
+    with pytest.raises(ValueError):
+        make_sampler('gaussian', BOX, START, GOAL)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from qtable import QTable
+from selfplay import BatchSelfPlay, wins, full, train_parallel
+
+
+def test_win_and_full_masks():
+    boards = np.array([[1, 1, 1, 0, 2, 2, 0, 0, 0],
+                       [2, 1, 0, 0, 2, 1, 0, 1, 2],
+                       [1, 2, 1, 1, 2, 2, 2, 1, 1],
+                       [0]*9])
+    assert list(wins(boards, 1)) == [True, False, False, False]
+    assert list(wins(boards, 2)) == [False, True, False, False]
+    assert list(full(boards)) == [False, False, True, False]
+
+
+def test_every_game_finishes():
+    games = BatchSelfPlay(QTable(), QTable(), seed=0).play(500, learn=False)
+    assert sum(games) == 500
+
+
+def test_training_beats_random_play():
+    def score(q):
+        x_wins, o_wins, draws = BatchSelfPlay(q, QTable(), epsilon=(0, 1), seed=1).play(2000, learn=False)
+        return x_wins - o_wins
+
+    q_x, q_o = QTable(symmetry=True), QTable(symmetry=True)
+    before = score(q_x)
+    BatchSelfPlay(q_x, q_o, seed=2).train(20000, batch=50)
+    assert len(q_x) > 0 and len(q_o) > 0
+    assert score(q_x) > before + 400
+
+
+def test_parallel_training_merges_tables():
+    reports = []
+    q_x, q_o = QTable(symmetry=True), QTable(symmetry=True)
+    totals = train_parallel(q_x, q_o, 6001, processes=2, rounds=3, seed=0,
+                            report=lambda *progress: reports.append(progress))
+    assert sum(totals) == 6001
+    assert [r[:2] for r in reports] == [(1, 2000), (2, 4000), (3, 6001)]
+    assert reports[-1][3] == totals and reports[-1][2] > 0
+    assert len(q_x) > 0 and len(q_o) > 0
@@ -0,0 +1,45 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+
+import rtica
+from collision import CollisionChecker
+from smoothing import shortcut, prune_collinear, resample, smooth
+
+
+def test_shortcut_skips_clear_vertices():
+    checker = CollisionChecker([], 1)
+    assert shortcut([(0, 0), (1, 1), (2, 0), (3, 1), (4, 0)], checker) == [(0, 0), (4, 0)]
+
+
+def test_shortcut_goes_around_obstacle():
+    checker = CollisionChecker([(50, 0, 10)], 1)
+    points = [(0, 0), (50, 20), (60, 20), (100, 0)]
+    kept = shortcut(points, checker)
+    assert kept[0] == (0, 0) and kept[-1] == (100, 0) and len(kept) == 3
+    assert checker.edges_free(kept[:-1], kept[1:]).all()
+
+
+def test_prune_collinear():
+    assert prune_collinear([(0, 0), (1, 1), (2, 2), (2, 3)]) == [(0, 0), (2, 2), (2, 3)]
+    assert prune_collinear([(0, 0)]) == [(0, 0)]
+
+
+def test_resample_spacing_and_corners():
+    points = resample([(0, 0), (10, 0), (10, 25)], 10)
+    assert points[0] == (0, 0) and points[-1] == (10, 25) and (10, 0) in points
+    steps = np.hypot(*np.diff(np.array(points), axis=0).T)
+    assert len(points) == 5 and (steps <= 10 + 1e-9).all()
+
+
+def test_smoothed_rrt_is_shorter_and_clear(monkeypatch):
+    monkeypatch.setattr(rtica, 'obstacles', [rtica.get_goal(5)])
+    raw = rtica.RRT(9, render=False, seed=3)
+    rtica.obstacles[:] = [rtica.get_goal(5)]
+    smoothed = rtica.RRT(9, render=False, seed=3, smooth=True)
+    assert smoothed[0] == raw[0] and smoothed[-1] == raw[-1]
+    assert len(smoothed) < len(raw)
+    points = [rtica.planar_coordinates(point) for point in smoothed]
+    checker = CollisionChecker([rtica.get_goal(5)], rtica.radius+1)
+    assert checker.edges_free(points[:-1], points[1:]).all()
@@ -0,0 +1,62 @@
+from random import Random
+
+from solver import Solver, wins
+
+
+def minimax(cells, mark):
+    # plain search without pruning or table
+    empty = cells.count(0)
+    best = -10
+    for cell in range(9):
+        if cells[cell] == 0:
+            cells[cell] = mark
+            if wins(cells, mark):
+                score = empty
+            elif empty == 1:
+                score = 0
+            else:
+                score = -minimax(cells, 3 - mark)
+            cells[cell] = 0
+            best = max(best, score)
+    return best
+
+
+def test_empty_board_is_a_draw():
+    solver = Solver()
+    assert solver.value([' ']*9, 'X') == 0
+    assert solver.value([' ']*9, 'O') == 0
+
+
+def test_takes_the_win_and_blocks():
+    solver = Solver()
+    grid = ['X', 'X', ' ',
+            'O', 'O', ' ',
+            ' ', ' ', ' ']
+    assert solver.best_moves(grid, 'X') == [3]
+    assert solver.best_moves(grid, 'O') == [6]
+    grid = ['X', ' ', ' ',
+            ' ', 'O', ' ',
+            ' ', ' ', 'X']
+    # O must not take a corner
+    assert set(solver.best_moves(grid, 'O')) == set([2, 4, 6, 8])
+
+
+def test_matches_plain_minimax():
+    solver = Solver()
+    rand = Random(0)
+    for _ in range(40):
+        cells = [0]*9
+        mark = rand.choice([1, 2])
+        for cell in rand.sample(range(9), rand.randint(2, 6)):
+            cells[cell] = mark
+            mark = 3 - mark
+        if wins(cells, 1) or wins(cells, 2):
+            continue
+        assert solver.value(cells, mark) == minimax(cells, mark)
+
+
+def test_solve_all():
+    solver = Solver()
+    positions = solver.solve_all()
+    assert positions > 4000
+    assert solver.best_moves([' ']*9, 'X') == [1, 2, 3, 4, 5, 6, 7, 8, 9]
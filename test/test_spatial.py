@@ -0,0 +1,37 @@
+from random import Random
+
+from spatial import make_index
+
+
+def build(kind, points, cell_size=15):
+    index = make_index(kind, cell_size)
+    for i, (x, y) in enumerate(points):
+        index.insert(i, x, y)
+    return index
+
+
+def test_grid_matches_brute_force():
+    rng = Random(0)
+    for trial in range(200):
+        points = [(rng.random()*150, rng.random()*150)
+                  for _ in range(rng.randint(1, 60))]
+        brute = build('brute', points)
+        grid = build('grid', points)
+        for _ in range(10):
+            # mix queries inside the space with ones well outside it
+            qx = rng.uniform(-50, 200)
+            qy = rng.uniform(-50, 200)
+            r = rng.choice([5, 15, 17.5, 40])
+            assert grid.nearest(qx, qy) == brute.nearest(qx, qy)
+            assert grid.near(qx, qy, r) == brute.near(qx, qy, r)
+
+
+def test_near_on_cell_boundary():
+    grid = build('grid', [(15.0, 0.0), (30.0, 0.0), (0.0, 14.9)])
+    assert grid.near(0.0, 0.0, 15) == [2]
+    assert grid.near(15.0, 0.0, 15.01) == [0, 1]
+
+
+def test_empty_index():
+    assert make_index('grid', 15).nearest(1, 1) is None
+    assert make_index('brute', 15).nearest(1, 1) is None
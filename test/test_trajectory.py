@@ -0,0 +1,72 @@
+import numpy as np
+
+from trajectory import time_parameterize, execute
+
+
+class SimulatedLimb(object):
+    # stands in for baxter_interface.Limb, records the streamed commands
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.commands = []
+
+    def set_joint_positions(self, positions):
+        self.commands.append((self.clock.now(), dict(positions)))
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.t = 0.0
+
+    def now(self):
+        return self.t
+
+    def sleep(self, seconds):
+        self.t += seconds
+
+
+WAYPOINTS = [{'left_s0': 0.0, 'left_e1': 1.0},
+             {'left_s0': 0.2, 'left_e1': 1.1},
+             {'left_s0': 0.5, 'left_e1': 1.1},
+             {'left_s0': 0.9, 'left_e1': 0.7},
+             {'left_s0': 0.9, 'left_e1': 0.7}]
+
+
+def test_passes_through_waypoints_within_limits():
+    trajectory = time_parameterize(WAYPOINTS, max_velocity=0.5, max_acceleration=1.0)
+    assert len(trajectory.times) == 4
+    for t, waypoint in zip(trajectory.times, WAYPOINTS):
+        assert np.allclose(trajectory.sample(t)[0], [waypoint[name] for name in trajectory.names])
+    # continuous motion: only the ends are at rest
+    assert np.abs(trajectory.sample(trajectory.times[1])[1]).max() > 0
+    assert np.allclose(trajectory.sample(0)[1], 0) and np.allclose(trajectory.sample(trajectory.duration)[1], 0)
+    for t in np.linspace(0, trajectory.duration, 500):
+        position, velocity, acceleration = trajectory.sample(t)
+        assert np.abs(velocity).max() <= 0.5 + 1e-6
+        assert np.abs(acceleration).max() <= 1.0 + 1e-6
+
+
+def test_faster_limits_are_quicker():
+    slow = time_parameterize(WAYPOINTS, max_velocity=0.5, max_acceleration=1.0)
+    fast = time_parameterize(WAYPOINTS, max_velocity=2.0, max_acceleration=4.0)
+    assert fast.duration < slow.duration
+
+
+def test_streams_to_a_simulated_limb():
+    clock = Clock()
+    limb = SimulatedLimb(clock)
+    trajectory = time_parameterize(WAYPOINTS)
+    execute(limb, trajectory, rate=50, now=clock.now, sleep=clock.sleep)
+    times = [t for t, _ in limb.commands]
+    assert np.allclose(np.diff(times), 0.02)
+    assert times[-1] >= trajectory.duration
+    assert limb.commands[-1][1] == WAYPOINTS[-1]
+    assert limb.commands[0][1] == WAYPOINTS[0]
+
+
+def test_single_waypoint():
+    clock = Clock()
+    limb = SimulatedLimb(clock)
+    execute(limb, time_parameterize(WAYPOINTS[:1]), now=clock.now, sleep=clock.sleep)
+    assert [command for _, command in limb.commands] == WAYPOINTS[:1]
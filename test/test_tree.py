@@ -0,0 +1,60 @@
+from math import sqrt
+
+import pytest
+
+from tree import Tree, NONE
+
+
+def test_add_tracks_cost_and_children():
+    tree = Tree()
+    root = tree.add(0, 0)
+    a = tree.add(3, 4, root)
+    b = tree.add(3, 8, a)
+    c = tree.add(6, 4, a)
+    assert tree.cost[b] == 9.0
+    assert sorted(tree.children(a)) == [b, c]
+    assert tree.parent[root] == NONE
+
+
+def test_set_parent_pushes_cost_to_descendants():
+    tree = Tree()
+    root = tree.add(0, 0)
+    a = tree.add(10, 0, root)
+    b = tree.add(20, 0, a)
+    c = tree.add(20, 10, b)
+    d = tree.add(0, 10, root)
+    tree.set_parent(b, d)
+    assert tree.children(a) == []
+    assert tree.children(d) == [b]
+    assert tree.cost[c] == pytest.approx(10 + sqrt(500) + 10)
+    for i in range(len(tree)):
+        assert tree.cost[i] == pytest.approx(tree.path_cost(i))
+
+
+def test_set_parent_unlinks_middle_sibling():
+    tree = Tree()
+    root = tree.add(0, 0)
+    children = [tree.add(i, 1, root) for i in range(4)]
+    other = tree.add(0, 5, root)
+    tree.set_parent(children[1], other)
+    assert sorted(tree.children(root)) == [children[0], children[2], children[3], other]
+
+
+def test_set_parent_rejects_descendant():
+    tree = Tree()
+    root = tree.add(0, 0)
+    a = tree.add(1, 0, root)
+    b = tree.add(2, 0, a)
+    with pytest.raises(ValueError):
+        tree.set_parent(a, b)
+
+
+def test_node_view_walks_like_node():
+    tree = Tree()
+    root = tree.add(0, 0)
+    a = tree.add(3, 4, root)
+    node = tree.node(tree.add(3, 8, a))
+    assert [(n.x, n.y) for n in node.path_to_start()] == [(3, 8), (3, 4), (0, 0)]
+    assert node.parent == tree.node(a)
+    assert node.path_to_start()[-1].parent is None
+    assert node.cost_to_start() == node.path_cost() == 9.0